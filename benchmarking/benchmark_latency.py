@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """
 Benchmarking script for IQ Option Bot API performance testing.
+
+Run with ``--pyperf`` to measure per-request latency with pyperf (warmups,
+calibration and outlier-resistant statistics); pyperf options such as
+``-o results.json`` are accepted in that mode.
 """
 
 import asyncio
+import sys
 import time
-import statistics
 from typing import List, Dict, Any
 import httpx
-import json
+import numpy as np
+import orjson
 
 
 class APIBenchmark:
@@ -20,53 +25,57 @@ class APIBenchmark:
                                 endpoint: str, 
                                 method: str = "GET", 
                                 data: Dict = None, 
-                                iterations: int = 10) -> Dict[str, Any]:
+                                iterations: int = 10,
+                                concurrency: int = 10) -> Dict[str, Any]:
         """Benchmark a specific API endpoint"""
         
-        print(f"\n🔧 Benchmarking {method} {endpoint} ({iterations} iterations)")
+        print(f"\n🔧 Benchmarking {method} {endpoint} ({iterations} iterations, concurrency {concurrency})")
         
         latencies = []
         errors = 0
+        sem = asyncio.Semaphore(concurrency)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for i in range(iterations):
-                start_time = time.time()
-                
-                try:
+        async with httpx.AsyncClient(timeout=30.0, limits=httpx.Limits(max_connections=50), http2=True) as client:
+            async def _one(i: int):
+                async with sem:
+                    start_time = time.perf_counter()
                     if method == "GET":
                         response = await client.get(f"{self.base_url}{endpoint}")
                     elif method == "POST":
                         response = await client.post(f"{self.base_url}{endpoint}", json=data)
-                    
-                    end_time = time.time()
-                    latency = (end_time - start_time) * 1000  # Convert to milliseconds
-                    
-                    if response.status_code == 200:
-                        latencies.append(latency)
-                    else:
-                        errors += 1
-                        print(f"  ❌ Request {i+1}: HTTP {response.status_code}")
-                        
-                except Exception as e:
-                    errors += 1
-                    print(f"  ❌ Request {i+1}: {str(e)}")
-                    
-                # Small delay between requests
-                await asyncio.sleep(0.1)
+                    latency = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+                    return latency, response.status_code
+            
+            outcomes = await asyncio.gather(*(_one(i) for i in range(iterations)), return_exceptions=True)
+        
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                errors += 1
+                print(f"  ❌ Request {i+1}: {str(outcome)}")
+                continue
+            
+            latency, status_code = outcome
+            if status_code == 200:
+                latencies.append(latency)
+            else:
+                errors += 1
+                print(f"  ❌ Request {i+1}: HTTP {status_code}")
         
         if latencies:
+            arr = np.asarray(latencies, dtype=np.float64)
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99])
             result = {
                 "endpoint": endpoint,
                 "method": method,
                 "iterations": iterations,
                 "successful_requests": len(latencies),
                 "errors": errors,
-                "avg_latency_ms": statistics.mean(latencies),
-                "min_latency_ms": min(latencies),
-                "max_latency_ms": max(latencies),
-                "median_latency_ms": statistics.median(latencies),
-                "p95_latency_ms": self._percentile(latencies, 95),
-                "p99_latency_ms": self._percentile(latencies, 99)
+                "avg_latency_ms": float(arr.mean()),
+                "min_latency_ms": float(arr.min()),
+                "max_latency_ms": float(arr.max()),
+                "median_latency_ms": float(p50),
+                "p95_latency_ms": float(p95),
+                "p99_latency_ms": float(p99)
             }
         else:
             result = {
@@ -81,19 +90,6 @@ class APIBenchmark:
         self.results.append(result)
         return result
     
-    def _percentile(self, data: List[float], percentile: int) -> float:
-        """Calculate percentile"""
-        if not data:
-            return 0
-        sorted_data = sorted(data)
-        index = (percentile / 100) * len(sorted_data)
-        if index.is_integer():
-            return sorted_data[int(index) - 1]
-        else:
-            lower = sorted_data[int(index)]
-            upper = sorted_data[int(index) + 1]
-            return (lower + upper) / 2
-    
     def print_results(self):
         """Print benchmark results"""
         print("\n" + "="*80)
@@ -117,11 +113,51 @@ class APIBenchmark:
     
     def save_results(self, filename: str = "benchmark_results.json"):
         """Save results to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         print(f"\n💾 Results saved to {filename}")
 
 
+# Test endpoints
+TEST_CASES = [
+    # Health checks (fast)
+    ("/health", "GET", None, 20),
+    
+    # Market data (moderate)
+    ("/market/data?asset=EURUSD", "GET", None, 15),
+    
+    # Trading operations (slower)
+    ("/trading/balance", "GET", None, 10),
+    ("/trading/history", "GET", None, 10),
+    
+    # LLM completion (slowest)
+    ("/llm/completion", "POST", {
+        "messages": [{"role": "user", "content": "What is 1+1?"}],
+        "temperature": 0.1
+    }, 5),
+]
+
+
+def run_pyperf(base_url: str = "http://localhost:8000/api/v1"):
+    """Benchmark each endpoint's request latency with pyperf.
+
+    pyperf builds a fresh event loop for every sample, which would throw away
+    an AsyncClient's pooled connections, so this uses a synchronous client that
+    keeps its connections alive across samples.
+    """
+    import pyperf
+
+    runner = pyperf.Runner(add_cmdline_args=lambda cmd, args: cmd.append("--pyperf"))
+    client = httpx.Client(base_url=base_url, timeout=30.0)
+
+    def _one_request(endpoint: str, method: str, data: Dict):
+        response = client.request(method, endpoint, json=data)
+        response.raise_for_status()
+
+    for endpoint, method, data, _ in TEST_CASES:
+        runner.bench_func(f"{method} {endpoint}", _one_request, endpoint, method, data)
+
+
 async def main():
     """Run comprehensive API benchmarks"""
     
@@ -130,32 +166,15 @@ async def main():
     
     benchmark = APIBenchmark()
     
-    # Test endpoints
-    test_cases = [
-        # Health checks (fast)
-        ("/health", "GET", None, 20),
-        
-        # Market data (moderate)
-        ("/market/data?asset=EURUSD", "GET", None, 15),
-        
-        # Trading operations (slower)
-        ("/trading/balance", "GET", None, 10),
-        ("/trading/history", "GET", None, 10),
-        
-        # LLM completion (slowest)
-        ("/llm/completion", "POST", {
-            "messages": [{"role": "user", "content": "What is 1+1?"}],
-            "temperature": 0.1
-        }, 5),
-    ]
-    
-    # Run benchmarks
-    for endpoint, method, data, iterations in test_cases:
-        await benchmark.benchmark_endpoint(endpoint, method, data, iterations)
+    # Run benchmarks (endpoints run concurrently; results are sorted before printing)
+    await asyncio.gather(*(
+        benchmark.benchmark_endpoint(endpoint, method, data, iterations)
+        for endpoint, method, data, iterations in TEST_CASES
+    ))
     
     # Test concurrent requests
     print(f"\n🔀 Testing concurrent requests...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     tasks = []
     for i in range(5):  # 5 concurrent requests
@@ -164,10 +183,11 @@ async def main():
     
     await asyncio.gather(*tasks)
     
-    concurrent_time = time.time() - start_time
+    concurrent_time = time.perf_counter() - start_time
     print(f"   ⏱️  5 concurrent requests took {concurrent_time:.2f}s")
     
     # Print and save results
+    benchmark.results.sort(key=lambda r: (r["method"], r["endpoint"]))
     benchmark.print_results()
     benchmark.save_results("data/benchmark_results.json")
     
@@ -177,4 +197,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if "--pyperf" in sys.argv:
+        sys.argv.remove("--pyperf")
+        run_pyperf()
+    else:
+        asyncio.run(main())
\ No newline at end of file
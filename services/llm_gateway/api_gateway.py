@@ -5,16 +5,16 @@
 # ======================================================================================
 
 import os
+import asyncio
 import logging
 import random
 from typing import Dict, List, Optional
-import json
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from provider_base import LLMProvider, CompletionRequest, CompletionResponse, Message
+from provider_base import LLMProvider, CompletionRequest, CompletionResponse, Message, json_dumps
 from providers.gemini_provider import GeminiProvider
 from providers.groq_provider import GroqProvider
 from providers.ollama_provider import OllamaProvider
@@ -23,7 +23,26 @@ from providers.github_models_provider import GitHubModelsProvider
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("llm_gateway")
 
-app = FastAPI(title="LLM API Gateway", version="2.2.1")
+# uvloop is a drop-in, libuv-backed event loop. uvicorn picks it up with
+# `--loop uvloop` (or `auto`); setting the policy here covers other runners.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+try:
+    import orjson  # noqa: F401
+    default_response_class = ORJSONResponse
+except ImportError:
+    default_response_class = JSONResponse
+
+# Streamed tokens arriving within this window (or until this many characters
+# accumulate) are merged into one SSE frame. COALESCE_MS=0 disables merging.
+COALESCE_MS = float(os.getenv("COALESCE_MS", "5"))
+COALESCE_MAX_CHARS = 64
+
+app = FastAPI(title="LLM API Gateway", version="2.2.1", default_response_class=default_response_class)
 providers: Dict[str, LLMProvider] = {}
 
 class CompletionRequestAPI(BaseModel):
@@ -34,6 +53,63 @@ class CompletionRequestAPI(BaseModel):
     fallback: bool = True
     stream: bool = False
 
+SSE_CONTENT_PREFIX = b'data: {"content":"'
+SSE_CONTENT_SUFFIX = b'"}\n\n'
+
+def sse_content_frame(chunk: str) -> bytes:
+    """Builds a `data: {"content": ...}` SSE frame.
+
+    Printable ASCII without quotes or backslashes needs no JSON escaping, which
+    covers most LLM output, so those chunks skip the encoder entirely.
+    """
+    if chunk.isascii() and chunk.isprintable() and '"' not in chunk and "\\" not in chunk:
+        return SSE_CONTENT_PREFIX + chunk.encode() + SSE_CONTENT_SUFFIX
+    return b"data: " + json_dumps({"content": chunk}) + b"\n\n"
+
+async def coalesce_chunks(chunks, window: float, max_chars: int):
+    """Merges chunks that arrive within `window` seconds of the first buffered one."""
+    if window <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    it = chunks.__aiter__()
+    pending = None
+    buf: List[str] = []
+    size = 0
+    deadline = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(it.__anext__())
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if done:
+                try:
+                    chunk = pending.result()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    if buf:
+                        yield "".join(buf)
+                    raise
+                finally:
+                    pending = None
+                buf.append(chunk)
+                size += len(chunk)
+                if deadline is None:
+                    deadline = loop.time() + window
+                if size < max_chars and loop.time() < deadline:
+                    continue
+            yield "".join(buf)
+            buf, size, deadline = [], 0, None
+        if buf:
+            yield "".join(buf)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Initializing providers based on environment flags...")
@@ -49,38 +125,53 @@ async def startup_event():
     if os.getenv('ENABLE_OLLAMA', 'true').lower() == 'true':
         providers["ollama"] = OllamaProvider()
         logger.info("Ollama provider instance created.")
-    logger.info(f"Startup complete. Configured providers: {list(providers.keys())}")
+    logger.info("Startup complete. Configured providers: %s", list(providers.keys()))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for p in providers.values():
+        await p.aclose()
 
 @app.get("/health", status_code=200, tags=["Gateway"])
 async def health_check():
     """A simple, non-blocking health check endpoint for Docker.""" 
     return {"status": "healthy", "active_providers": list(providers.keys())}
 
+async def check_providers() -> Dict[str, bool]:
+    """Probes every configured provider concurrently."""
+    names = list(providers.keys())
+    avails = await asyncio.gather(*(providers[n].is_available() for n in names))
+    return dict(zip(names, avails))
+
 @app.get("/providers", tags=["Gateway"])
 async def list_providers():
     """Lists all configured providers and their runtime availability."""
-    details = {}
-    for name, p in providers.items():
-        details[name] = {"available": await p.is_available()}
-    return details
+    return {n: {"available": a} for n, a in (await check_providers()).items()}
 
 @app.post("/completion", tags=["LLM"])
 async def get_completion(request: CompletionRequestAPI):
-    available_providers = [name for name, p in providers.items() if await p.is_available()]
+    available_providers = [n for n, a in (await check_providers()).items() if a]
     if not available_providers:
         raise HTTPException(status_code=503, detail="No LLM providers are currently available.")
     
     provider_name = request.provider if request.provider in available_providers else random.choice(available_providers)
     
-    provider_request = CompletionRequest(**request.dict())
+    # The API model is already validated; skip a second validation pass.
+    provider_request = CompletionRequest.model_construct(
+        messages=request.messages,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+        stream=request.stream,
+    )
 
     async def stream_generator():
         try:
-            async for chunk in providers[provider_name].get_streaming_completion(provider_request):
-                yield f"data: {json.dumps({'content': chunk})}\n\n"
+            chunks = providers[provider_name].get_streaming_completion(provider_request)
+            async for chunk in coalesce_chunks(chunks, COALESCE_MS / 1000, COALESCE_MAX_CHARS):
+                yield sse_content_frame(chunk)
         except Exception as e:
-            logger.error(f"Provider '{provider_name}' failed during stream: {e}")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            logger.error("Provider '%s' failed during stream: %s", provider_name, e)
+            yield b"data: " + json_dumps({"error": str(e)}) + b"\n\n"
 
     if request.stream:
         return StreamingResponse(stream_generator(), media_type="text/event-stream")
@@ -88,5 +179,5 @@ async def get_completion(request: CompletionRequestAPI):
         try:
             return await providers[provider_name].get_completion(provider_request)
         except Exception as e:
-            logger.error(f"Provider '{provider_name}' failed: {e}")
+            logger.error("Provider '%s' failed: %s", provider_name, e)
             raise HTTPException(status_code=500, detail=str(e))
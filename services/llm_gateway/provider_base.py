@@ -6,9 +6,25 @@
 # updated to accept floats in its `usage` dictionary to correctly parse responses
 # from providers like Groq that return fractional time values.
 # ======================================================================================
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
-from pydantic import BaseModel
+import httpx
+from pydantic import BaseModel, PrivateAttr
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    import json
+
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 class Message(BaseModel):
     role: str
@@ -20,6 +36,14 @@ class CompletionRequest(BaseModel):
     max_tokens: Optional[int] = None
     stream: bool = False
 
+    _messages_raw: Optional[List[Dict[str, str]]] = PrivateAttr(default=None)
+
+    def messages_as_dicts(self) -> List[Dict[str, str]]:
+        """Plain-dict messages, built once and reused across provider fallbacks."""
+        if self._messages_raw is None:
+            self._messages_raw = [{"role": m.role, "content": m.content} for m in self.messages]
+        return self._messages_raw
+
 class CompletionResponse(BaseModel):
     content: str
     provider_name: str
@@ -27,6 +51,34 @@ class CompletionResponse(BaseModel):
     usage: Dict[str, int | float] = {}
 
 class LLMProvider(ABC):
+    # Pooled HTTP client, created on first use and kept for the process lifetime
+    # so keep-alive connections are reused across requests.
+    _client: Optional[httpx.AsyncClient] = None
+    _client_timeout: float = 30.0
+    # HTTP/2 multiplexes concurrent streams over one connection; only useful
+    # for TLS upstreams, so providers opt in.
+    _client_http2: bool = False
+
+    # Availability is cached briefly so every /completion call doesn't re-probe.
+    _avail_ttl: float = 5.0
+    _avail_cached: Optional[bool] = None
+    _avail_ts: float = 0.0
+    _avail_lock: Optional[asyncio.Lock] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._client_timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                http2=self._client_http2,
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     @abstractmethod
     async def get_completion(self, request: CompletionRequest) -> CompletionResponse:
         pass
@@ -39,7 +91,19 @@ class LLMProvider(ABC):
     def get_name(self) -> str:
         pass
 
-    @abstractmethod
     async def is_available(self) -> bool:
+        if self._avail_cached is not None and time.monotonic() - self._avail_ts < self._avail_ttl:
+            return self._avail_cached
+        if self._avail_lock is None:
+            self._avail_lock = asyncio.Lock()
+        async with self._avail_lock:
+            # Another caller may have refreshed the value while we waited.
+            if self._avail_cached is None or time.monotonic() - self._avail_ts >= self._avail_ttl:
+                self._avail_cached = await self._check_available()
+                self._avail_ts = time.monotonic()
+            return self._avail_cached
+
+    @abstractmethod
+    async def _check_available(self) -> bool:
         pass
 
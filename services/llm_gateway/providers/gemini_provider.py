@@ -25,7 +25,7 @@ class GeminiProvider(LLMProvider):
         except Exception as e:
             raise RuntimeError(f"Failed to configure Gemini client: {e}")
 
-    async def is_available(self) -> bool:
+    async def _check_available(self) -> bool:
         return bool(self._api_key)
 
     async def get_completion(self, request: CompletionRequest) -> CompletionResponse:
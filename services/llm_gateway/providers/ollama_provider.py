@@ -3,95 +3,116 @@
 #
 import os
 import httpx
-import json
 import logging
-from provider_base import LLMProvider, CompletionRequest, CompletionResponse
+from provider_base import LLMProvider, CompletionRequest, CompletionResponse, json_loads
 
 logger = logging.getLogger(__name__)
 
 class OllamaProvider(LLMProvider):
+    _client_timeout = 120.0
+
     def __init__(self):
         self.base_url = os.environ.get("OLLAMA_BASE_URL", "http://ollama:11434")
         self.model_name = os.environ.get("OLLAMA_DEFAULT_MODEL", "llama3")
         self._endpoint = None
         self._legacy_format = False
+        self._build_payload = self._build_chat_payload
 
     def get_name(self) -> str:
         return "ollama"
 
-    async def _probe_endpoint(self):
-        if self._endpoint is not None:
-            return
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.head(f"{self.base_url}/api/chat", follow_redirects=True)
-                if response.status_code == 404:
-                    logger.warning("Ollama endpoint /api/chat not found. Falling back to legacy /api/generate.")
-                    self._endpoint = "/api/generate"
-                    self._legacy_format = True
-                else:
-                    logger.info("Confirmed modern Ollama endpoint at /api/chat (status: %d).", response.status_code)
-                    self._endpoint = "/api/chat"
-                    self._legacy_format = False
-        except httpx.RequestError as e:
-            logger.warning("Could not connect to Ollama to probe endpoint: %s. Assuming legacy /api/generate.", e)
-            self._endpoint = "/api/generate"
-            self._legacy_format = True
-
-    async def is_available(self) -> bool:
+    async def _check_available(self) -> bool:
+        """Liveness check that also detects whether the server supports /api/chat."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.head(self.base_url, timeout=3.0)
-                if self._endpoint is None:
-                    await self._probe_endpoint()
-                return response.status_code == 200
-        except (httpx.ConnectError, httpx.TimeoutException):
+            client = await self._get_client()
+            response = await client.head(f"{self.base_url}/api/chat", timeout=3.0, follow_redirects=True)
+        except httpx.RequestError:
+            return False
+        # /api/chat only accepts POST, so a live server answers the HEAD probe with 405
+        # (404 on servers that predate it); anything else is not an Ollama server we can use
+        status = response.status_code
+        if not (response.is_success or status in (404, 405)):
             return False
+        endpoint = "/api/generate" if status == 404 else "/api/chat"
+        if endpoint != self._endpoint:
+            if endpoint == "/api/generate":
+                logger.warning("Ollama endpoint /api/chat not found. Falling back to legacy /api/generate.")
+            else:
+                logger.info("Confirmed modern Ollama endpoint at /api/chat (status: %d).", status)
+            self._endpoint = endpoint
+            self._legacy_format = endpoint == "/api/generate"
+            # The endpoint is stable for the process lifetime, so bind the matching
+            # payload builder once instead of branching on every request.
+            self._build_payload = self._build_legacy_payload if self._legacy_format else self._build_chat_payload
+        return True
 
-    def _prepare_payload(self, request: CompletionRequest, stream: bool) -> dict:
-        """Correctly prepares the payload including all options."""
-        if self._legacy_format:
-            prompt = "\n".join([f"{msg.content}" for msg in request.messages])
-            payload = {"model": self.model_name, "prompt": prompt, "stream": stream}
-        else:
-            payload = {"model": self.model_name, "messages": [msg.dict() for msg in request.messages], "stream": stream}
-        
+    async def _ensure_endpoint(self):
+        if self._endpoint is None and not await self.is_available():
+            raise RuntimeError("Ollama server is not reachable.")
+
+    def _build_chat_payload(self, request: CompletionRequest, stream: bool) -> dict:
+        payload = {"model": self.model_name, "messages": request.messages_as_dicts(), "stream": stream}
+        return self._with_options(payload, request)
+
+    def _build_legacy_payload(self, request: CompletionRequest, stream: bool) -> dict:
+        prompt = "\n".join(msg.content for msg in request.messages)
+        payload = {"model": self.model_name, "prompt": prompt, "stream": stream}
+        return self._with_options(payload, request)
+
+    @staticmethod
+    def _with_options(payload: dict, request: CompletionRequest) -> dict:
+        max_tokens, temperature = request.max_tokens, request.temperature
+        if max_tokens is None and temperature is None:
+            return payload
         options = {}
-        if request.max_tokens is not None:
-            options["num_predict"] = request.max_tokens
-        if request.temperature is not None:
-            options["temperature"] = request.temperature
-        
-        if options:
-            payload["options"] = options
-            
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        if temperature is not None:
+            options["temperature"] = temperature
+        payload["options"] = options
         return payload
 
     async def get_completion(self, request: CompletionRequest) -> CompletionResponse:
-        await self._probe_endpoint()
-        payload = self._prepare_payload(request, stream=False)
+        await self._ensure_endpoint()
+        payload = self._build_payload(request, False)
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(f"{self.base_url}{self._endpoint}", json=payload)
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("response") if self._legacy_format else data.get("message", {}).get("content", "")
-            return CompletionResponse(content=content, provider_name=self.get_name(), model=data.get("model", self.model_name))
+        client = await self._get_client()
+        response = await client.post(f"{self.base_url}{self._endpoint}", json=payload)
+        response.raise_for_status()
+        data = json_loads(await response.aread())
+        content = data.get("response") if self._legacy_format else data.get("message", {}).get("content", "")
+        return CompletionResponse(content=content, provider_name=self.get_name(), model=data.get("model", self.model_name))
 
     async def get_streaming_completion(self, request: CompletionRequest):
-        await self._probe_endpoint()
-        payload = self._prepare_payload(request, stream=True)
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            async with client.stream("POST", f"{self.base_url}{self._endpoint}", json=payload) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    logger.info(f"Ollama raw stream line: {line}")
-                    try:
-                        data = json.loads(line)
-                        chunk = data.get("response") if self._legacy_format else data.get("message", {}).get("content", "")
-                        if chunk:
-                            yield chunk
-                    except json.JSONDecodeError:
-                        logger.warning(f"Failed to decode JSON from line: {line}")
-                        continue
+        await self._ensure_endpoint()
+        payload = self._build_payload(request, True)
+        client = await self._get_client()
+        async with client.stream("POST", f"{self.base_url}{self._endpoint}", json=payload) as response:
+            response.raise_for_status()
+            # Ollama streams NDJSON; split on newlines ourselves instead of per-line text decoding.
+            buf = bytearray()
+            async for raw in response.aiter_bytes(chunk_size=8192):
+                buf += raw
+                while (i := buf.find(b"\n")) >= 0:
+                    line = bytes(buf[:i])
+                    del buf[:i + 1]
+                    chunk = self._parse_stream_line(line)
+                    if chunk:
+                        yield chunk
+            if buf.strip():
+                chunk = self._parse_stream_line(bytes(buf))
+                if chunk:
+                    yield chunk
+
+    def _parse_stream_line(self, line: bytes) -> str:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Ollama raw stream line: %r", line)
+        if not line.strip():
+            return ""
+        try:
+            data = json_loads(line)
+        except ValueError:
+            logger.warning("Failed to decode JSON from line: %r", line)
+            return ""
+        return data.get("response") if self._legacy_format else data.get("message", {}).get("content", "")
 
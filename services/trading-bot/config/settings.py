@@ -1,5 +1,25 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
+from dotenv import dotenv_values
+from functools import lru_cache
+from pathlib import Path
+from pydantic_settings import BaseSettings, DotEnvSettingsSource
+from pydantic_settings.sources import parse_env_vars
+from typing import Dict, List, Mapping, Optional
+
+
+@lru_cache(maxsize=8)
+def _parse_env_file(path: str, mtime_ns: int, encoding: str) -> Dict[str, Optional[str]]:
+    """Parse a .env file with python-dotenv; cached until the file's mtime changes."""
+    return dict(dotenv_values(path, encoding=encoding))
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """Dotenv source that re-reads a .env file only when it has changed."""
+    
+    def _read_env_file(self, file_path: Path) -> Mapping[str, Optional[str]]:
+        file_vars = _parse_env_file(
+            str(file_path), file_path.stat().st_mtime_ns, self.env_file_encoding or "utf8"
+        )
+        return parse_env_vars(file_vars, self.case_sensitive, self.env_ignore_empty, self.env_parse_none_str)
 
 
 class Settings(BaseSettings):
@@ -25,6 +45,7 @@ class Settings(BaseSettings):
     # Application
     log_level: str = "INFO"
     debug: bool = False
+    cors_origins: List[str] = []  # JSON list, e.g. ["https://dashboard.example.com"]
     
     # Trading
     default_risk_per_trade: float = 0.02  # 2% risk per trade
@@ -33,6 +54,42 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = False
+    
+    @classmethod
+    def settings_customise_sources(cls, settings_cls, init_settings, env_settings, dotenv_settings, file_secret_settings):
+        dotenv_settings = CachedDotEnvSettingsSource(
+            settings_cls,
+            env_file=dotenv_settings.env_file,
+            env_file_encoding=dotenv_settings.env_file_encoding,
+        )
+        return init_settings, env_settings, dotenv_settings, file_secret_settings
+    
+    @classmethod
+    def for_demo(cls) -> "Settings":
+        """Settings with placeholder credentials, built without reading the environment or validating."""
+        return cls.model_construct(iq_option_email="demo", iq_option_password="demo")
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Build the settings on first use and reuse them for the process lifetime."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def use_settings(settings: Optional[Settings]) -> None:
+    """Install the settings returned by get_settings(); None rebuilds them on next use."""
+    global _settings
+    _settings = settings
 
 
-settings = Settings()
\ No newline at end of file
+def __getattr__(name: str):
+    # Keep `from config.settings import settings` working without building the
+    # settings (and requiring every credential) at import time.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
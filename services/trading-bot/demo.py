@@ -2,22 +2,29 @@
 """Demo script showing the new trading features in action."""
 
 import asyncio
+import contextvars
+import io
 import sys
-import json
-from pathlib import Path
 
-# Add the service directory to Python path
-service_dir = Path(__file__).parent
-sys.path.insert(0, str(service_dir))
+# The script's own directory is already on sys.path, so these resolve once at startup
+from src.config.trading_config import config_parser
+from src.core.manifests import (
+    BollingerBandsIndicator, MACDIndicator, PriceActionTrigger, RSIIndicator,
+    VolumeSpikeTrigger, manifest_loader
+)
+from src.integrations.chart_data import ChartDataService
+from config.settings import Settings, use_settings
+from demo_data import CUSTOM_MANIFESTS, SAMPLE_PRICES, existing_files
+
+# The demos run against mock services, so skip loading real credentials
+use_settings(Settings.for_demo())
 
 async def demo_chart_data():
     """Demonstrate chart data fetching."""
     print("\n🔥 Chart Data Service Demo")
     print("=" * 50)
     
-    from src.integrations.chart_data import ChartDataService
-    
-    service = ChartDataService()
+    service = ChartDataService.instance()
     
     # Fetch single asset data
     print("📊 Fetching EURUSD M5 data...")
@@ -49,26 +56,17 @@ async def demo_indicators():
     print("\n⚙️ Technical Indicators Demo")
     print("=" * 50)
     
-    from src.core.manifests import RSIIndicator, MACDIndicator, BollingerBandsIndicator
-    
-    # Generate sample price data
-    sample_prices = [
-        1.2000, 1.2010, 1.2005, 1.1995, 1.2020, 1.2015, 1.2025, 1.2030, 1.2020, 1.2040,
-        1.2050, 1.2045, 1.2055, 1.2060, 1.2040, 1.2030, 1.2035, 1.2025, 1.2015, 1.2020,
-        1.2025, 1.2030, 1.2035, 1.2040, 1.2038, 1.2042, 1.2045, 1.2048, 1.2050, 1.2055
-    ]
-    
     # RSI Calculation
     print("📊 RSI Indicator:")
     rsi = RSIIndicator({"period": 14})
-    rsi_result = rsi.calculate(sample_prices)
+    rsi_result = rsi.calculate(SAMPLE_PRICES)
     if rsi_result['rsi']:
         print(f"   Latest RSI: {rsi_result['rsi'][-1]:.2f}")
     
     # MACD Calculation  
     print("\n📈 MACD Indicator:")
     macd = MACDIndicator({"fast_period": 12, "slow_period": 26, "signal_period": 9})
-    macd_result = macd.calculate(sample_prices)
+    macd_result = macd.calculate(SAMPLE_PRICES)
     if macd_result['macd']:
         print(f"   MACD Line: {macd_result['macd'][-1]:.6f}")
         print(f"   Signal Line: {macd_result['signal'][-1]:.6f}")
@@ -77,7 +75,7 @@ async def demo_indicators():
     # Bollinger Bands
     print("\n📊 Bollinger Bands:")
     bb = BollingerBandsIndicator({"period": 20, "std_dev": 2})
-    bb_result = bb.calculate(sample_prices)
+    bb_result = bb.calculate(SAMPLE_PRICES)
     if bb_result['upper']:
         print(f"   Upper Band: {bb_result['upper'][-1]:.5f}")
         print(f"   Middle Band: {bb_result['middle'][-1]:.5f}") 
@@ -89,8 +87,6 @@ async def demo_triggers():
     print("\n🎯 Trading Triggers Demo")
     print("=" * 50)
     
-    from src.core.manifests import PriceActionTrigger, VolumeSpikeTrigger
-    
     # Mock market data
     mock_candles = [
         {"close": 1.2000, "volume": 1500},
@@ -128,8 +124,6 @@ async def demo_configuration():
     print("\n⚙️ Configuration System Demo")
     print("=" * 50)
     
-    from src.config.trading_config import config_parser
-    
     # Load configuration
     config = config_parser.load_config()
     trading_config = config.trading
@@ -156,21 +150,19 @@ async def demo_manifest_loading():
     print("\n📦 Manifest System Demo")
     print("=" * 50)
     
-    from src.core.manifests import manifest_loader
-    
-    # Check if custom manifests exist
-    custom_files = [
-        "custom_indicators/CustomIndicator.yml",
-        "triggers/CustomTrigger.yml", 
-        "news/NewsSentimentFeed.yml"
-    ]
+    # Stat and parse the manifests off the event loop, in parallel
+    exists = await asyncio.to_thread(existing_files, CUSTOM_MANIFESTS)
+    found = [p for p in CUSTOM_MANIFESTS if exists[p]]
+    loaded = await asyncio.gather(
+        *(asyncio.to_thread(manifest_loader.load_manifest_from_file, p) for p in found)
+    )
+    manifests = dict(zip(found, loaded))
     
     print("📂 Available Custom Manifests:")
-    for file_path in custom_files:
-        if Path(file_path).exists():
+    for file_path in CUSTOM_MANIFESTS:
+        if exists[file_path]:
             print(f"   ✅ {file_path}")
-            # Try to load the manifest
-            manifest = manifest_loader.load_manifest_from_file(file_path)
+            manifest = manifests[file_path]
             if manifest:
                 print(f"      📋 {manifest.name} v{manifest.version}")
                 print(f"      📝 {manifest.description}")
@@ -178,6 +170,39 @@ async def demo_manifest_loading():
             print(f"   ❌ {file_path} (not found)")
 
 
+# Each concurrently running demo prints into its own buffer so the output
+# can be replayed in order instead of interleaving.
+_demo_output: contextvars.ContextVar = contextvars.ContextVar("demo_output")
+
+
+class _TaskLocalStdout:
+    """stdout proxy that writes to the current task's demo buffer, if any."""
+    
+    def __init__(self, fallback):
+        self._fallback = fallback
+    
+    def write(self, text: str) -> int:
+        return _demo_output.get(self._fallback).write(text)
+    
+    def flush(self):
+        self._fallback.flush()
+    
+    def __getattr__(self, name):
+        # encoding, isatty(), fileno() and the rest come from the real stdout
+        return getattr(self._fallback, name)
+
+
+async def _run_buffered(demo) -> str:
+    """Run one demo, capturing everything it prints."""
+    buffer = io.StringIO()
+    _demo_output.set(buffer)
+    try:
+        await demo
+    except Exception as e:
+        print(f"❌ Demo failed: {e}")
+    return buffer.getvalue()
+
+
 async def main():
     """Run the comprehensive demo."""
     print("🚀 IQ Option Bot API - New Features Demo")
@@ -191,21 +216,31 @@ async def main():
         demo_manifest_loading(),
     ]
     
-    for demo in demos:
-        try:
-            await demo
-            await asyncio.sleep(0.5)  # Small pause between demos
-        except Exception as e:
-            print(f"❌ Demo failed: {e}")
-    
-    print("\n🎉 Demo completed successfully!")
-    print("\nTo start the trading agent:")
-    print("  from src.core.trading_agent import TradingAgent")  
-    print("  agent = TradingAgent()")
-    print("  await agent.start()")
-    print("\nOr use the REST API:")
-    print("  POST /api/v1/chart/agent/start")
+    stdout = sys.stdout
+    sys.stdout = _TaskLocalStdout(stdout)
+    try:
+        outputs = await asyncio.gather(*(_run_buffered(demo) for demo in demos))
+    finally:
+        sys.stdout = stdout
+    outputs.append(
+        "\n🎉 Demo completed successfully!\n"
+        "\nTo start the trading agent:\n"
+        "  from src.core.trading_agent import TradingAgent\n"
+        "  agent = TradingAgent()\n"
+        "  await agent.start()\n"
+        "\nOr use the REST API:\n"
+        "  POST /api/v1/chart/agent/start\n"
+    )
+    stdout.write("".join(outputs))
+    stdout.flush()
 
 
 if __name__ == "__main__":
+    # uvloop is a drop-in, libuv-backed event loop; fall back to asyncio's own
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -2,14 +2,25 @@
 """Complete system demonstration - IQ Option Trading Bot with full integration."""
 
 import asyncio
+import contextlib
+import io
 import sys
-import json
-from pathlib import Path
 from datetime import datetime
 
-# Add the service directory to Python path
-service_dir = Path(__file__).parent
-sys.path.insert(0, str(service_dir))
+# The script's own directory is already on sys.path, so these resolve once at startup.
+# IQOptionService and TradingAgent pull in the broker and LLM SDKs, so their
+# sections still import them on demand and report failures in place.
+from src.config.trading_config import config_parser
+from src.core.manifests import (
+    BollingerBandsIndicator, MACDIndicator, MomentumTrigger, PriceActionTrigger,
+    RSIIndicator, VolumeSpikeTrigger, manifest_loader
+)
+from src.integrations.chart_data import ChartDataService
+from config.settings import Settings, use_settings
+from demo_data import CUSTOM_MANIFESTS, SAMPLE_PRICES, existing_files
+
+# The demos run against mock services, so skip loading real credentials
+use_settings(Settings.for_demo())
 
 async def demonstrate_complete_system():
     """Demonstrate the complete integrated trading system."""
@@ -32,8 +43,6 @@ async def demonstrate_complete_system():
     print("="*50)
     
     try:
-        from src.config.trading_config import config_parser
-        
         config = config_parser.load_config()
         trading_config = config.trading
         iq_config = config.iq_option
@@ -83,12 +92,13 @@ async def demonstrate_complete_system():
         print(f"\n📈 Market Data:")
         assets_to_test = ["EURUSD", "GBPUSD", "BTCUSD"]
         
-        for asset in assets_to_test[:2]:  # Test first 2 assets
-            market_open = await service.is_market_open(asset)
-            quote = await service.get_real_time_quote(asset)
+        snapshots = await service.get_asset_snapshot(assets_to_test[:2])  # Test first 2 assets
+        
+        for asset, snapshot in snapshots.items():
+            quote = snapshot["quote"]
             
             print(f"   • {asset}:")
-            print(f"     - Market Open: {market_open}")
+            print(f"     - Market Open: {snapshot['market_open']}")
             if quote:
                 print(f"     - Price: {quote['price']}")
                 print(f"     - Time: {quote['timestamp']}")
@@ -105,9 +115,7 @@ async def demonstrate_complete_system():
     print("="*50)
     
     try:
-        from src.integrations.chart_data import ChartDataService
-        
-        chart_service = ChartDataService()
+        chart_service = ChartDataService.instance()
         
         print(f"📈 Fetching Chart Data:")
         
@@ -149,26 +157,17 @@ async def demonstrate_complete_system():
     print("="*50)
     
     try:
-        from src.core.manifests import RSIIndicator, MACDIndicator, BollingerBandsIndicator
-        
-        # Generate sample price data
-        sample_prices = [
-            1.2000, 1.2010, 1.2005, 1.1995, 1.2020, 1.2015, 1.2025, 1.2030, 1.2020, 1.2040,
-            1.2050, 1.2045, 1.2055, 1.2060, 1.2040, 1.2030, 1.2035, 1.2025, 1.2015, 1.2020,
-            1.2025, 1.2030, 1.2035, 1.2040, 1.2038, 1.2042, 1.2045, 1.2048, 1.2050, 1.2055
-        ]
-        
         print(f"🔧 Calculating Indicators:")
         
         # RSI
         rsi = RSIIndicator({"period": 14})
-        rsi_result = rsi.calculate(sample_prices)
+        rsi_result = rsi.calculate(SAMPLE_PRICES)
         if rsi_result['rsi']:
             print(f"   • RSI (14): {rsi_result['rsi'][-1]:.2f}")
         
         # MACD
         macd = MACDIndicator({"fast_period": 12, "slow_period": 26, "signal_period": 9})
-        macd_result = macd.calculate(sample_prices)
+        macd_result = macd.calculate(SAMPLE_PRICES)
         if macd_result['macd']:
             print(f"   • MACD: {macd_result['macd'][-1]:.6f}")
             print(f"   • Signal: {macd_result['signal'][-1]:.6f}")
@@ -176,7 +175,7 @@ async def demonstrate_complete_system():
         
         # Bollinger Bands
         bb = BollingerBandsIndicator({"period": 20, "std_dev": 2})
-        bb_result = bb.calculate(sample_prices)
+        bb_result = bb.calculate(SAMPLE_PRICES)
         if bb_result['upper']:
             print(f"   • Bollinger Upper: {bb_result['upper'][-1]:.5f}")
             print(f"   • Bollinger Middle: {bb_result['middle'][-1]:.5f}")
@@ -193,8 +192,6 @@ async def demonstrate_complete_system():
     print("="*50)
     
     try:
-        from src.core.manifests import PriceActionTrigger, VolumeSpikeTrigger, MomentumTrigger
-        
         # Mock market data with signals
         mock_candles = [
             {"close": 1.2000, "volume": 1500},
@@ -279,22 +276,21 @@ async def demonstrate_complete_system():
     print("="*50)
     
     try:
-        from src.core.manifests import manifest_loader
-        
         print(f"📂 Available Custom Manifests:")
         
-        custom_files = [
-            "custom_indicators/CustomIndicator.yml",
-            "triggers/CustomTrigger.yml",
-            "news/NewsSentimentFeed.yml"
-        ]
+        # Stat and parse the manifests off the event loop, in parallel
+        exists = await asyncio.to_thread(existing_files, CUSTOM_MANIFESTS)
+        found = [p for p in CUSTOM_MANIFESTS if exists[p]]
+        loaded = await asyncio.gather(
+            *(asyncio.to_thread(manifest_loader.load_manifest_from_file, p) for p in found)
+        )
+        manifests = dict(zip(found, loaded))
         
-        for file_path in custom_files:
-            if Path(file_path).exists():
+        for file_path in CUSTOM_MANIFESTS:
+            if exists[file_path]:
                 print(f"   ✅ {file_path}")
                 
-                # Try to load the manifest
-                manifest = manifest_loader.load_manifest_from_file(file_path)
+                manifest = manifests[file_path]
                 if manifest:
                     print(f"      • Name: {manifest.name} v{manifest.version}")
                     print(f"      • Type: {manifest.type}")
@@ -344,7 +340,19 @@ async def demonstrate_complete_system():
 
 async def main():
     """Run the complete system demonstration."""
-    await demonstrate_complete_system()
+    # Collect the demo's output and emit it with a single write
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        await demonstrate_complete_system()
+    sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
+    # uvloop is a drop-in, libuv-backed event loop; fall back to asyncio's own
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""Sample market data and helpers shared by the demo scripts."""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+
+# 30 EURUSD-like closes; float64 so the indicators use it without conversion
+SAMPLE_PRICES: np.ndarray = np.array([
+    1.2000, 1.2010, 1.2005, 1.1995, 1.2020, 1.2015, 1.2025, 1.2030, 1.2020, 1.2040,
+    1.2050, 1.2045, 1.2055, 1.2060, 1.2040, 1.2030, 1.2035, 1.2025, 1.2015, 1.2020,
+    1.2025, 1.2030, 1.2035, 1.2040, 1.2038, 1.2042, 1.2045, 1.2048, 1.2050, 1.2055
+], dtype=np.float64)
+SAMPLE_PRICES.setflags(write=False)
+
+
+# Example manifests shipped with the service
+CUSTOM_MANIFESTS = [
+    "custom_indicators/CustomIndicator.yml",
+    "triggers/CustomTrigger.yml",
+    "news/NewsSentimentFeed.yml",
+]
+
+
+def existing_files(paths: Iterable[str]) -> Dict[str, bool]:
+    """Check which paths exist with one directory scan per parent, not one stat per file."""
+    paths = list(paths)
+    present: Dict[Path, set] = {}
+    for parent in {Path(p).parent for p in paths}:
+        try:
+            with os.scandir(parent) as entries:
+                present[parent] = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            present[parent] = set()
+    return {p: Path(p).name in present[Path(p).parent] for p in paths}
@@ -1,76 +1,104 @@
 import asyncio
 import httpx
 import pytest
+import pytest_asyncio
 from datetime import datetime
+from typing import Dict
 from src.models.trading import TradeDirection
 
+BASE_URL = "http://localhost:8000"
 
-async def test_api_health():
+
+def create_client() -> httpx.AsyncClient:
+    """Create the client shared by all tests so one keep-alive connection is reused"""
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10)
+    )
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with create_client() as client:
+        yield client
+
+
+async def test_api_health(client: httpx.AsyncClient):
     """Test the health endpoint"""
-    async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-        response = await client.get("/api/v1/health")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "healthy"
-        print("✓ Health check passed")
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    print("✓ Health check passed")
 
 
-async def test_get_market_data():
+async def test_get_market_data(client: httpx.AsyncClient):
     """Test getting market data"""
-    async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-        response = await client.get("/api/v1/market/EURUSD")
-        assert response.status_code == 200
-        data = response.json()
-        assert "asset" in data
-        assert data["asset"] == "EURUSD"
-        print("✓ Market data retrieval passed")
+    response = await client.get("/api/v1/market/EURUSD")
+    assert response.status_code == 200
+    data = response.json()
+    assert "asset" in data
+    assert data["asset"] == "EURUSD"
+    print("✓ Market data retrieval passed")
 
 
-async def test_llm_analysis():
+async def test_llm_analysis(client: httpx.AsyncClient):
     """Test LLM market analysis"""
-    async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-        # First get market data
-        market_response = await client.get("/api/v1/market/EURUSD")
-        assert market_response.status_code == 200
-        market_data = market_response.json()
-        
-        # Then test analysis
-        payload = {"asset": "EURUSD", "market_data": market_data, "risk_level": 0.5}
-        response = await client.post("/api/v1/analyze", json=payload)
-        # Note: This might fail if LLM provider is misconfigured, so we'll handle that
-        print(f"LLM Analysis status: {response.status_code}")
-        if response.status_code == 200:
-            data = response.json()
-            assert "decision" in data
-            print("✓ LLM analysis passed")
-        else:
-            print("⚠ LLM analysis failed (likely due to missing API key)")
+    # First get market data
+    market_response = await client.get("/api/v1/market/EURUSD")
+    assert market_response.status_code == 200
+    market_data = market_response.json()
+    
+    # Then test analysis
+    payload = {"asset": "EURUSD", "market_data": market_data, "risk_level": 0.5}
+    response = await client.post("/api/v1/analyze", json=payload)
+    # Note: This might fail if LLM provider is misconfigured, so we'll handle that
+    print(f"LLM Analysis status: {response.status_code}")
+    if response.status_code == 200:
+        data = response.json()
+        assert "decision" in data
+        print("✓ LLM analysis passed")
+    else:
+        print("⚠ LLM analysis failed (likely due to missing API key)")
 
 
-async def test_trading_endpoint():
+async def test_trading_endpoint(client: httpx.AsyncClient):
     """Test the trading endpoint"""
-    async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-        # Get current market data
-        market_response = await client.get("/api/v1/market/EURUSD")
-        assert market_response.status_code == 200
-        market_data = market_response.json()
-        
-        # Try to execute a trade
-        trade_payload = {
-            "asset": "EURUSD",
-            "direction": "call",
-            "amount": 10,
-            "duration": 60
-        }
-        
-        response = await client.post("/api/v1/trade", json=trade_payload)
-        print(f"Trade execution status: {response.status_code}")
-        if response.status_code == 200:
-            data = response.json()
-            assert "trade_id" in data
-            print("✓ Trade execution passed")
-        else:
-            print("⚠ Trade execution failed (likely due to missing API keys or mock implementation)")
+    # Get current market data
+    market_response = await client.get("/api/v1/market/EURUSD")
+    assert market_response.status_code == 200
+    market_data = market_response.json()
+    
+    # Try to execute a trade
+    trade_payload = {
+        "asset": "EURUSD",
+        "direction": "call",
+        "amount": 10,
+        "duration": 60
+    }
+    
+    response = await client.post("/api/v1/trade", json=trade_payload)
+    print(f"Trade execution status: {response.status_code}")
+    if response.status_code == 200:
+        data = response.json()
+        assert "trade_id" in data
+        print("✓ Trade execution passed")
+    else:
+        print("⚠ Trade execution failed (likely due to missing API keys or mock implementation)")
+
+
+async def get_readiness(client: httpx.AsyncClient) -> Dict[str, bool]:
+    """Read the LLM/broker readiness flags from the health endpoint"""
+    try:
+        data = (await client.get("/api/v1/health")).json()
+    except Exception:
+        data = {}
+    # Servers that don't report the flags get every test
+    return {
+        "llm_ready": data.get("llm_ready", True),
+        "broker_ready": data.get("broker_ready", True),
+    }
 
 
 async def run_all_tests():
@@ -78,29 +106,41 @@ async def run_all_tests():
     print("Starting end-to-end tests for LLM Trading Bot API...")
     print("="*50)
     
-    try:
-        await test_api_health()
-    except Exception as e:
-        print(f"✗ Health check failed: {str(e)}")
-    
-    try:
-        await test_get_market_data()
-    except Exception as e:
-        print(f"✗ Market data test failed: {str(e)}")
-    
-    try:
-        await test_llm_analysis()
-    except Exception as e:
-        print(f"✗ LLM analysis test failed: {str(e)}")
+    async with create_client() as client:
+        readiness = await get_readiness(client)
+        
+        tests = [
+            ("Health check", test_api_health),
+            ("Market data test", test_get_market_data),
+        ]
+        if readiness["llm_ready"]:
+            tests.append(("LLM analysis test", test_llm_analysis))
+        else:
+            print("⚠ LLM analysis test skipped (LLM provider not configured)")
+        if readiness["llm_ready"] and readiness["broker_ready"]:
+            tests.append(("Trading test", test_trading_endpoint))
+        else:
+            print("⚠ Trading test skipped (LLM provider or broker not configured)")
+        
+        results = await asyncio.gather(
+            *(test(client) for _, test in tests),
+            return_exceptions=True
+        )
     
-    try:
-        await test_trading_endpoint()
-    except Exception as e:
-        print(f"✗ Trading test failed: {str(e)}")
+    for (name, _), result in zip(tests, results):
+        if isinstance(result, Exception):
+            print(f"✗ {name} failed: {str(result)}")
     
     print("="*50)
     print("End-to-end tests completed")
 
 
 if __name__ == "__main__":
+    # uvloop is a drop-in, libuv-backed event loop; fall back to asyncio's own
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(run_all_tests())
\ No newline at end of file
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Setup script for IQ Option trading bot integration."""
 
+import argparse
+import mmap
 import os
 import sys
 import shutil
@@ -16,11 +18,33 @@ def print_step(step_num, description):
     print(f"\n📋 Step {step_num}: {description}")
     print("-" * 50)
 
-def run_command(command, description=""):
-    """Run a command and return success status."""
+def confirm(prompt, default=False):
+    """Ask a yes/no question on the terminal; an empty answer takes the default."""
+    suffix = "(Y/n)" if default else "(y/N)"
+    response = input(f"🤔 {prompt} {suffix}: ").lower().strip()
+    if not response:
+        return default
+    return response == 'y'
+
+def run_command(command, description="", stream=False):
+    """Run a command and return success status.
+    
+    With stream=True the command's output is echoed line by line while it
+    runs instead of being collected until it exits.
+    """
     try:
         print(f"🔧 {description or command}")
-        result = subprocess.run(command.split(), check=True, capture_output=True, text=True)
+        if stream:
+            with subprocess.Popen(
+                command.split(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+            ) as process:
+                for line in process.stdout:
+                    print(f"   {line}", end="")
+            if process.returncode != 0:
+                print(f"❌ Failed: exit code {process.returncode}")
+                return False
+        else:
+            subprocess.run(command.split(), check=True, capture_output=True, text=True)
         print(f"✅ Success")
         return True
     except subprocess.CalledProcessError as e:
@@ -78,19 +102,26 @@ def install_dependencies():
     else:
         pip_command = "pip"
     
-    success = run_command(f"{pip_command} install -r requirements.txt", "Installing dependencies")
+    # Current pip and wheel let packages install from (and be cached as) wheels
+    run_command(f"{pip_command} install -U pip wheel", "Upgrading pip and wheel")
+    
+    # pip retries flaky downloads itself; the fallbacks below are for environments
+    # that refuse the install outright
+    install_args = "install --prefer-binary --retries 3 -r requirements.txt"
+    
+    success = run_command(f"{pip_command} {install_args}", "Installing dependencies", stream=True)
     
     if not success:
         print("\n⚠️ Standard pip install failed. Trying alternative method...")
-        success = run_command(f"{pip_command} install --user -r requirements.txt", "Installing with --user flag")
+        success = run_command(f"{pip_command} {install_args} --user", "Installing with --user flag", stream=True)
     
     if not success:
         print("\n⚠️ Pip install failed. Trying with --break-system-packages flag...")
-        success = run_command(f"{pip_command} install --break-system-packages -r requirements.txt", "Installing with --break-system-packages")
+        success = run_command(f"{pip_command} {install_args} --break-system-packages", "Installing with --break-system-packages", stream=True)
     
     return success
 
-def setup_environment_file():
+def setup_environment_file(overwrite=False, interactive=False):
     """Set up environment configuration file."""
     env_file = Path(".env")
     env_example = Path(".env.example")
@@ -98,8 +129,9 @@ def setup_environment_file():
     if env_file.exists():
         print("📁 .env file already exists")
         
-        response = input("🤔 Do you want to overwrite it? (y/N): ").lower().strip()
-        if response != 'y':
+        if interactive:
+            overwrite = confirm("Do you want to overwrite it?")
+        if not overwrite:
             print("⏭️ Keeping existing .env file")
             return True
     
@@ -137,10 +169,15 @@ def verify_configuration():
     
     # Check if credentials are configured
     try:
-        with open(env_file, 'r') as f:
-            content = f.read()
+        # Scan the raw bytes in place; the file never needs decoding
+        with open(env_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                placeholder_found = False
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    placeholder_found = mm.find(b"your_actual_email@example.com") != -1
             
-        if "your_actual_email@example.com" in content:
+        if placeholder_found:
             print("⚠️  You still need to configure your IQ Option credentials in .env")
             return False
         else:
@@ -175,8 +212,18 @@ def run_tests():
     print("❌ Test files not found")
     return False
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Set up the IQ Option trading bot.")
+    parser.add_argument("--interactive", action="store_true", help="Prompt for each choice instead of using flags")
+    parser.add_argument("--no-venv", action="store_true", help="Do not create a virtual environment")
+    parser.add_argument("--force-env", action="store_true", help="Overwrite an existing .env from .env.example")
+    parser.add_argument("--yes", action="store_true", help="Continue even if dependency installation fails")
+    return parser.parse_args()
+
 def main():
     """Main setup process."""
+    args = parse_args()
+    
     print_header("IQ Option Trading Bot Setup")
     
     print("🚀 Welcome to the IQ Option Trading Bot Setup!")
@@ -189,8 +236,8 @@ def main():
     
     # Step 2: Set up virtual environment
     print_step(2, "Setting up virtual environment")
-    use_venv = input("🤔 Create virtual environment? (Y/n): ").lower().strip()
-    if use_venv != 'n':
+    use_venv = confirm("Create virtual environment?", default=True) if args.interactive else not args.no_venv
+    if use_venv:
         if not setup_virtual_environment():
             print("⚠️ Continuing without virtual environment...")
     
@@ -201,13 +248,13 @@ def main():
         print("   pip install -r requirements.txt")
         print("   or: pip install --break-system-packages -r requirements.txt")
         
-        response = input("🤔 Continue anyway? (y/N): ").lower().strip()
-        if response != 'y':
+        keep_going = confirm("Continue anyway?") if args.interactive else args.yes
+        if not keep_going:
             sys.exit(1)
     
     # Step 4: Set up environment file
     print_step(4, "Setting up environment configuration")
-    if not setup_environment_file():
+    if not setup_environment_file(overwrite=args.force_env, interactive=args.interactive):
         print("❌ Failed to set up environment file")
         sys.exit(1)
     
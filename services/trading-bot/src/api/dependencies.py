@@ -0,0 +1,18 @@
+"""Request dependencies resolving the service singletons created at app startup."""
+
+from fastapi import Request
+from src.core.trading.service import TradingService
+from src.core.market.service import MarketService
+from src.core.llm.service import LLMService
+
+
+def get_market_service(request: Request) -> MarketService:
+    return request.app.state.market_service
+
+
+def get_trading_service(request: Request) -> TradingService:
+    return request.app.state.trading_service
+
+
+def get_llm_service(request: Request) -> LLMService:
+    return request.app.state.llm_service
@@ -1,15 +1,45 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from config.settings import settings
+from fastapi.responses import JSONResponse, ORJSONResponse
+from config.settings import get_settings
 from src.api.routers import trading, health, llm, chart
+from src.api.routers.chart import get_iq_service
 from src.core.market.service import MarketService
-from src.integrations.iq_option.service import IQOptionService
+from src.core.trading.service import TradingService
+from src.core.llm.service import LLMService
+from src.core.llm.integration import trading_llm
+from logging.handlers import QueueHandler, QueueListener
 import logging
+import queue
 
 # Set up logging
-logging.basicConfig(level=settings.log_level.upper())
+logging.basicConfig(level=get_settings().log_level.upper())
 logger = logging.getLogger(__name__)
 
+
+def start_log_listener() -> QueueListener:
+    """Route root-logger records through a queue so handler I/O runs on a listener thread, not the event loop."""
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+def stop_log_listener(listener: QueueListener):
+    """Flush queued records and hand the original handlers back to the root logger."""
+    listener.stop()
+    logging.getLogger().handlers = list(listener.handlers)
+
+
+# orjson serializes responses (notably chart candles) several times faster
+try:
+    import orjson  # noqa: F401
+    default_response_class = ORJSONResponse
+except ImportError:
+    default_response_class = JSONResponse
+
 # Initialize FastAPI app
 app = FastAPI(
     title="LLM Trading Bot API",
@@ -17,35 +47,44 @@ app = FastAPI(
     version="1.0.0",
     openapi_url="/api/v1/openapi.json",
     docs_url="/api/v1/docs",
-    redoc_url="/api/v1/redoc"
+    redoc_url="/api/v1/redoc",
+    default_response_class=default_response_class
 )
 
-# Add CORS middleware
+# Add CORS middleware; the wildcard is only allowed in debug mode
+settings = get_settings()
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=settings.cors_origins or (["*"] if settings.debug else []),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
-# Initialize services
-market_service = MarketService()
-iq_option_service = IQOptionService()
-
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    app.state.log_listener = start_log_listener()
     logger.info("Starting up LLM Trading Bot API")
-    await market_service.startup()
-    await iq_option_service.connect()
+    # One instance of each service for the app; routers resolve them through Depends
+    app.state.market_service = MarketService()
+    await app.state.market_service.startup()
+    app.state.iq_service = get_iq_service()
+    await app.state.iq_service.connect()
+    app.state.trading_service = TradingService(app.state.iq_service)
+    app.state.llm_service = LLMService()
     
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up services on shutdown"""
     logger.info("Shutting down LLM Trading Bot API")
-    await market_service.shutdown()
-    await iq_option_service.disconnect()
+    await app.state.market_service.shutdown()
+    trading_agent = getattr(app.state, "trading_agent", None)
+    if trading_agent and trading_agent.running:
+        await trading_agent.stop()
+    await app.state.iq_service.disconnect()
+    await trading_llm.aclose()
+    stop_log_listener(app.state.log_listener)
 
 
 # Include routers
@@ -1,22 +1,103 @@
-from fastapi import APIRouter
-from typing import Dict
+import asyncio
+import time
+from fastapi import APIRouter, Request, Response
+from typing import Any, Dict, Optional
+from config.settings import get_settings
 
 router = APIRouter()
 
+# Seconds a readiness result is reused, and the budget for each probe
+READINESS_TTL = 0.5
+PROBE_TIMEOUT = 0.5
+
+_readiness: Dict[str, Any] = {"task": None, "checked_at": 0.0}
+
+# Settings field holding the API key each LLM provider needs (None: no key required)
+LLM_PROVIDER_KEYS = {
+    "openai": "openai_api_key",
+    "anthropic": "anthropic_api_key",
+    "gemini": "gemini_api_key",
+    "ollama": None,
+}
+
+
+def _llm_ready() -> bool:
+    """Whether the configured LLM provider has what it needs to serve requests."""
+    settings = get_settings()
+    if settings.llm_provider not in LLM_PROVIDER_KEYS:
+        return False
+    key_field = LLM_PROVIDER_KEYS[settings.llm_provider]
+    return key_field is None or bool(getattr(settings, key_field))
+
+
+def _broker_ready() -> bool:
+    """Whether IQ Option credentials are configured."""
+    settings = get_settings()
+    return bool(settings.iq_option_email and settings.iq_option_password)
+
 
 @router.get("/health")
-async def health_check() -> Dict[str, str]:
+async def health_check() -> Dict[str, Any]:
     """
     Health check endpoint
+
+    Also reports whether the LLM provider and broker are configured, so
+    clients can skip calls that are bound to fail.
     """
-    return {"status": "healthy", "service": "llm-trading-bot-api"}
+    return {
+        "status": "healthy",
+        "service": "llm-trading-bot-api",
+        "llm_ready": _llm_ready(),
+        "broker_ready": _broker_ready(),
+    }
+
+
+async def _probe_broker(iq_service) -> bool:
+    if iq_service is None:
+        return False
+    status = await iq_service.get_connection_status()
+    return status["connected"]
+
+
+async def _probe_config() -> bool:
+    from src.config.trading_config import get_config_parser
+    await asyncio.to_thread(get_config_parser().load_config)
+    return True
+
+
+async def _probe_all(iq_service) -> Dict[str, bool]:
+    """Run every readiness probe concurrently; a probe that fails or times out counts as not ready."""
+    names = ("broker", "config")
+    results = await asyncio.gather(
+        asyncio.wait_for(_probe_broker(iq_service), PROBE_TIMEOUT),
+        asyncio.wait_for(_probe_config(), PROBE_TIMEOUT),
+        return_exceptions=True
+    )
+    checks = {name: result is True for name, result in zip(names, results)}
+    checks["llm"] = _llm_ready()
+    _readiness["checked_at"] = time.monotonic()
+    return checks
 
 
 @router.get("/ready")
-async def readiness_check() -> Dict[str, str]:
+async def readiness_check(request: Request, response: Response) -> Dict[str, Any]:
     """
     Readiness check endpoint
+
+    Concurrent and back-to-back probes share one check for READINESS_TTL
+    seconds, so a burst of load-balancer probes costs a single round-trip.
     """
-    # Here we would check if all dependencies are ready
-    # For now, we'll just return that the service is ready
-    return {"status": "ready", "service": "llm-trading-bot-api"}
\ No newline at end of file
+    task: Optional[asyncio.Task] = _readiness["task"]
+    if task is None or (task.done() and time.monotonic() - _readiness["checked_at"] > READINESS_TTL):
+        iq_service = getattr(request.app.state, "iq_service", None)
+        task = _readiness["task"] = asyncio.create_task(_probe_all(iq_service))
+    
+    checks = await asyncio.shield(task)
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "not_ready",
+        "service": "llm-trading-bot-api",
+        "checks": checks,
+    }
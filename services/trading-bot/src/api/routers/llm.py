@@ -1,13 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any
 from src.core.llm.service import LLMService
+from src.api.dependencies import get_llm_service
 
 router = APIRouter()
-llm_service = LLMService()
 
 
 @router.post("/analyze")
-async def analyze_market_data(payload: Dict[str, Any]):
+async def analyze_market_data(payload: Dict[str, Any], llm_service: LLMService = Depends(get_llm_service)):
     """
     Analyze market data using LLM
     Expected payload: 
@@ -29,7 +29,7 @@ async def analyze_market_data(payload: Dict[str, Any]):
 
 
 @router.get("/providers")
-async def get_llm_providers():
+async def get_llm_providers(llm_service: LLMService = Depends(get_llm_service)):
     """
     Get available LLM providers
     """
@@ -1,33 +1,56 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from src.models.trading import TradeRequest, TradeResponse, MarketData, LLMResponse
 from src.core.trading.service import TradingService
 from src.core.market.service import MarketService
 from src.core.llm.service import LLMService
+from src.api.dependencies import get_market_service, get_trading_service, get_llm_service
 
 router = APIRouter()
 
-# Initialize services
-trading_service = TradingService()
-market_service = MarketService()
-llm_service = LLMService()
-
 
 @router.post("/trade", response_model=TradeResponse)
-async def execute_trade(trade_request: TradeRequest):
+async def execute_trade(
+    trade_request: TradeRequest,
+    market_service: MarketService = Depends(get_market_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    trading_service: TradingService = Depends(get_trading_service)
+):
     """
     Execute a trade based on LLM decision
     """
+    iq_service = trading_service.iq_option_service
+    asset = trade_request.asset
+    
+    # A disconnected broker reports the market closed and a 0.0 balance; say what actually failed
+    if not iq_service.connected:
+        raise HTTPException(status_code=503, detail="IQ Option is not connected")
+    
+    # Broker preconditions don't depend on the market data or the LLM, so they
+    # run alongside both; the LLM call starts as soon as market data arrives
+    preconditions = asyncio.gather(iq_service.is_market_open(asset), iq_service.get_balance())
+    llm_task = None
     try:
         # Get market data for the requested asset
-        market_data = await market_service.get_market_data(trade_request.asset)
+        market_data = await market_service.get_market_data(asset)
         
         # Get LLM decision
-        llm_decision = await llm_service.get_trading_decision(
-            asset=trade_request.asset,
+        llm_task = asyncio.create_task(llm_service.get_trading_decision(
+            asset=asset,
             market_data=market_data,
             risk_level=trade_request.risk_level
-        )
+        ))
+        
+        market_open, balance = await preconditions
+        if not iq_service.connected:
+            raise HTTPException(status_code=503, detail="IQ Option is not connected")
+        if not market_open:
+            raise HTTPException(status_code=400, detail=f"Market is closed for {asset}")
+        if balance < trade_request.amount:
+            raise HTTPException(status_code=400, detail=f"Insufficient balance: {balance} < {trade_request.amount}")
+        
+        llm_decision = await llm_task
         
         # Execute the trade
         trade_result = await trading_service.execute_trade(
@@ -36,12 +59,18 @@ async def execute_trade(trade_request: TradeRequest):
         )
         
         return trade_result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        preconditions.cancel()
+        if llm_task is not None:
+            llm_task.cancel()
 
 
 @router.get("/trades", response_model=List[TradeResponse])
-async def get_trades():
+async def get_trades(trading_service: TradingService = Depends(get_trading_service)):
     """
     Get all recent trades
     """
@@ -53,7 +82,7 @@ async def get_trades():
 
 
 @router.get("/market/{asset}", response_model=MarketData)
-async def get_market_data(asset: str):
+async def get_market_data(asset: str, market_service: MarketService = Depends(get_market_service)):
     """
     Get current market data for an asset
     """
@@ -65,7 +94,11 @@ async def get_market_data(asset: str):
 
 
 @router.post("/analyze", response_model=LLMResponse)
-async def analyze_market(asset: str):
+async def analyze_market(
+    asset: str,
+    market_service: MarketService = Depends(get_market_service),
+    llm_service: LLMService = Depends(get_llm_service)
+):
     """
     Get LLM analysis for an asset
     """
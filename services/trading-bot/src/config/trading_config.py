@@ -1,30 +1,36 @@
 """Trading configuration models and parser for YAML-based trading settings."""
 
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, validator
-from datetime import time
+from typing import Annotated, List, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field, StringConstraints
+from time import monotonic
+import logging
 import yaml
 import os
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
+logger = logging.getLogger(__name__)
+
+# Format checks run as patterns inside pydantic-core instead of Python validators
+TimeStr = Annotated[str, StringConstraints(pattern=r"^([01]\d|2[0-3]):[0-5]\d(:[0-5]\d)?$")]
+BalanceStr = Annotated[str, StringConstraints(pattern=r"\d")]  # must contain a numeric value
+IntervalStr = Annotated[str, StringConstraints(pattern=r"^\d+[smh]$")]  # e.g. "30s", "2m", "1h"
+
 
 class TradingHours(BaseModel):
-    start: str = Field(..., description="Trading start time in HH:MM format")
-    end: str = Field(..., description="Trading end time in HH:MM format")
-    
-    @validator('start', 'end')
-    def validate_time_format(cls, v):
-        try:
-            time.fromisoformat(v)
-            return v
-        except ValueError:
-            raise ValueError(f"Invalid time format: {v}. Use HH:MM format.")
+    start: TimeStr = Field(..., description="Trading start time in HH:MM format")
+    end: TimeStr = Field(..., description="Trading end time in HH:MM format")
 
 
 class TradingConfig(BaseModel):
     max_daily_trades: int = Field(default=5, ge=1)
-    balance: str = Field(default="10$", description="Starting balance with currency symbol")
-    wake_interval: str = Field(default="2m", description="Sync interval for chart timeframe")
+    balance: BalanceStr = Field(default="10$", description="Starting balance with currency symbol")
+    wake_interval: IntervalStr = Field(default="2m", description="Sync interval for chart timeframe")
     stop_after_losses: int = Field(default=1, ge=1)
     trade_amount_ratio: float = Field(default=0.1, ge=0.01, le=1.0)
     win_amount_multiplier: float = Field(default=1.7, ge=1.0)
@@ -33,24 +39,6 @@ class TradingConfig(BaseModel):
     timeframes: List[str] = Field(default=["M1", "M5", "M15"], description="Chart timeframes")
     context_feeds: List[str] = Field(default=[], description="Context feeds for LLM")
     triggers: List[str] = Field(default=[], description="Trading triggers")
-    
-    @validator('balance')
-    def validate_balance(cls, v):
-        # Extract numeric value and currency
-        if not any(c.isdigit() for c in v):
-            raise ValueError("Balance must contain a numeric value")
-        return v
-    
-    @validator('wake_interval')
-    def validate_wake_interval(cls, v):
-        # Basic validation for interval format (e.g., "2m", "30s", "1h")
-        if not v[-1] in ['s', 'm', 'h']:
-            raise ValueError("Wake interval must end with 's' (seconds), 'm' (minutes), or 'h' (hours)")
-        try:
-            int(v[:-1])
-        except ValueError:
-            raise ValueError("Wake interval must start with a number")
-        return v
 
 
 class IQOptionConfig(BaseModel):
@@ -100,25 +88,47 @@ class FullConfig(BaseModel):
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
 
+# Config file locations tried in order when $IQ_BOT_CONFIG is not set
+CONFIG_CANDIDATES = (
+    "settings.yml",
+    "config.yml",
+    "../../../settings.yml",  # From trading-bot service to root
+)
+USER_CONFIG_PATH = "~/.iq-option-bot/settings.yml"
+
+
 class TradingConfigParser:
     """Parser for trading configuration from YAML files."""
     
+    BUILTIN_INDICATORS = frozenset({"RSI", "MACD", "BollingerBands", "SMA", "EMA", "STOCH"})
+    BUILTIN_TRIGGERS = frozenset({"PriceActionTrigger", "VolumeSpikeTrigger", "MomentumTrigger"})
+    MANIFEST_SUFFIXES = ('.yml', '.yaml')
+    
+    # Seconds between checks of the config file's mtime; accessors return the loaded config in between
+    STAT_INTERVAL = 1.0
+    
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or self._find_config_file()
         self._config: Optional[FullConfig] = None
+        self._config_key: Optional[tuple] = None
+        self._checked_at = 0.0
     
     def _find_config_file(self) -> str:
-        """Find the configuration file in common locations."""
-        possible_paths = [
-            "settings.yml",
-            "config.yml",
-            "../../../settings.yml",  # From trading-bot service to root
-            os.path.expanduser("~/.iq-option-bot/settings.yml"),
-        ]
+        """Find the configuration file: $IQ_BOT_CONFIG if set, else the first of CONFIG_CANDIDATES that exists."""
+        env_path = os.environ.get("IQ_BOT_CONFIG")
+        if env_path:
+            return env_path
         
-        for path in possible_paths:
-            if os.path.exists(path):
+        for path in CONFIG_CANDIDATES:
+            try:
+                os.stat(path)
                 return path
+            except OSError:
+                continue
+        
+        user_path = os.path.expanduser(USER_CONFIG_PATH)
+        if os.path.exists(user_path):
+            return user_path
         
         # If no config file found, create a default one
         default_path = "settings.yml"
@@ -128,81 +138,148 @@ class TradingConfigParser:
     def _create_default_config(self, path: str):
         """Create a default configuration file."""
         default_config = FullConfig()
-        with open(path, 'w') as f:
-            # Convert to dict and write as YAML
-            yaml.dump(default_config.dict(), f, default_flow_style=False, indent=2)
+        self._dump_yaml(path, default_config.model_dump(mode='python'))
     
-    def load_config(self) -> FullConfig:
-        """Load configuration from YAML file."""
-        if self._config is None:
-            try:
-                with open(self.config_path, 'r') as f:
-                    data = yaml.safe_load(f)
-                self._config = FullConfig(**data)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
-            except yaml.YAMLError as e:
-                raise ValueError(f"Error parsing YAML configuration: {e}")
-            except Exception as e:
-                raise ValueError(f"Error loading configuration: {e}")
+    @staticmethod
+    def _dump_yaml(path: str, data: Dict[str, Any]):
+        with open(path, 'wb') as f:
+            yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False, indent=2, encoding='utf-8')
+    
+    def _stat_key(self) -> tuple:
+        """Identify the current contents of the config file by path and mtime."""
+        return (self.config_path, os.stat(self.config_path).st_mtime_ns)
+    
+    def load_config(self, fast: bool = False) -> FullConfig:
+        """
+        Load configuration from YAML file, reusing the parsed result while the file is unchanged.
+        
+        With fast=True, the file's mtime is checked at most once per STAT_INTERVAL;
+        a changed file is always validated in full.
+        """
+        now = monotonic()
+        if fast and self._config is not None and now - self._checked_at < self.STAT_INTERVAL:
+            return self._config
+        
+        try:
+            key = self._stat_key()
+        except FileNotFoundError:
+            if self._config is not None:
+                return self._config
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+        
+        if self._config is None or self._config_key != key:
+            self._config = self._parse_config()
+            self._config_key = key
+        self._checked_at = now
         
         return self._config
     
+    def _parse_config(self) -> FullConfig:
+        """Parse and validate the YAML file."""
+        try:
+            # Binary mode hands the raw bytes to libyaml, which detects the encoding itself
+            with open(self.config_path, 'rb') as f:
+                data = yaml.load(f, Loader=SafeLoader) or {}
+            return FullConfig(**data)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+        except yaml.YAMLError as e:
+            raise ValueError(f"Error parsing YAML configuration: {e}")
+        except Exception as e:
+            raise ValueError(f"Error loading configuration: {e}")
+    
+    def reload(self) -> FullConfig:
+        """Drop the cached configuration and parse the file again."""
+        self._config = self._parse_config()
+        self._config_key = self._stat_key()
+        return self._config
+    
     def save_config(self, config: FullConfig):
         """Save configuration to YAML file."""
-        with open(self.config_path, 'w') as f:
-            yaml.dump(config.dict(), f, default_flow_style=False, indent=2)
+        self._dump_yaml(self.config_path, config.model_dump(mode='python'))
         self._config = config
+        self._config_key = self._stat_key()
+    
+    def save_trading_config(self, trading: TradingConfig):
+        """Replace only the trading section of the YAML file; the other sections are kept as written."""
+        with open(self.config_path, 'rb') as f:
+            data = yaml.load(f, Loader=SafeLoader) or {}
+        data["trading"] = trading.model_dump(mode='python')
+        self._dump_yaml(self.config_path, data)
+        
+        if self._config is not None:
+            self._config = self._config.model_copy(update={"trading": trading})
+        else:
+            self._config = self._parse_config()
+        self._config_key = self._stat_key()
     
     def get_trading_config(self) -> TradingConfig:
         """Get the trading configuration section."""
-        return self.load_config().trading
+        return self.load_config(fast=True).trading
     
     def get_iq_option_config(self) -> IQOptionConfig:
         """Get the IQ Option configuration section."""
-        return self.load_config().iq_option
+        return self.load_config(fast=True).iq_option
     
     def validate_context_feeds(self, trading_config: TradingConfig) -> List[str]:
         """Validate and resolve context feeds (builtin and custom)."""
-        builtin_indicators = {"RSI", "MACD", "BollingerBands", "SMA", "EMA", "STOCH"}
-        builtin_triggers = {"PriceActionTrigger", "VolumeSpikeTrigger", "MomentumTrigger"}
-        
         validated_feeds = []
         
         for feed in trading_config.context_feeds:
-            if feed in builtin_indicators:
+            if feed in self.BUILTIN_INDICATORS:
                 validated_feeds.append(feed)
-            elif feed.endswith('.yml') or feed.endswith('.yaml'):
+            elif feed.endswith(self.MANIFEST_SUFFIXES):
                 # Custom manifest file
                 if os.path.exists(feed):
                     validated_feeds.append(feed)
                 else:
-                    print(f"Warning: Custom manifest file not found: {feed}")
+                    logger.warning("Custom manifest file not found: %s", feed)
             else:
-                print(f"Warning: Unknown context feed: {feed}")
+                logger.warning("Unknown context feed: %s", feed)
         
         return validated_feeds
     
     def validate_triggers(self, trading_config: TradingConfig) -> List[str]:
         """Validate and resolve triggers (builtin and custom)."""
-        builtin_triggers = {"PriceActionTrigger", "VolumeSpikeTrigger", "MomentumTrigger"}
-        
         validated_triggers = []
         
         for trigger in trading_config.triggers:
-            if trigger in builtin_triggers:
+            if trigger in self.BUILTIN_TRIGGERS:
                 validated_triggers.append(trigger)
-            elif trigger.endswith('.yml') or trigger.endswith('.yaml'):
+            elif trigger.endswith(self.MANIFEST_SUFFIXES):
                 # Custom manifest file
                 if os.path.exists(trigger):
                     validated_triggers.append(trigger)
                 else:
-                    print(f"Warning: Custom trigger file not found: {trigger}")
+                    logger.warning("Custom trigger file not found: %s", trigger)
             else:
-                print(f"Warning: Unknown trigger: {trigger}")
+                logger.warning("Unknown trigger: %s", trigger)
         
         return validated_triggers
 
 
-# Global configuration instance
-config_parser = TradingConfigParser()
\ No newline at end of file
+_config_parser: Optional[TradingConfigParser] = None
+
+
+def get_config_parser() -> TradingConfigParser:
+    """Global configuration parser, created on first use so importing this module touches no files."""
+    global _config_parser
+    if _config_parser is None:
+        _config_parser = TradingConfigParser()
+    return _config_parser
+
+
+def __getattr__(name: str):
+    # Keep `from src.config.trading_config import config_parser` working
+    if name == "config_parser":
+        return get_config_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == "__main__":
+    # Full validation of a config file, e.g. as a CI check: python -m src.config.trading_config settings.yml
+    import sys
+    
+    path = sys.argv[1] if len(sys.argv) > 1 else get_config_parser().config_path
+    TradingConfigParser(path)._parse_config()
+    print(f"{path}: OK")
\ No newline at end of file
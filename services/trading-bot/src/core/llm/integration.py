@@ -6,10 +6,41 @@ This module connects the trading bot service to the LLM Gateway
 import httpx
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from src.core.llm.parsing import extract_json
 
 logger = logging.getLogger(__name__)
 
+# Fields of the text format older prompts requested; used when a model ignores the JSON instruction
+_RE_DIRECTION = re.compile(r"DIRECTION:\s*((?i:CALL|PUT))\s*$", re.MULTILINE)
+_RE_CONFIDENCE = re.compile(r"CONFIDENCE:\s*(\d+)")
+_RE_REASONING = re.compile(r"REASONING:[ \t]*(.*\S)")
+
+_RECOMMENDATION_PROMPT = """Analyze {asset} for binary options trading:
+
+Market Data:
+- Price: {price}
+- Volume: {volume}
+- Timestamp: {timestamp}
+
+Respond with ONLY this JSON:
+{{"direction": "CALL or PUT", "confidence": <1-10>, "reasoning": "<max 30 words>"}}
+
+Be concise and decisive."""
+
+_BATCH_PROMPT = """Analyze these assets for binary options trading:
+
+{assets}
+
+Respond with ONLY a JSON array, one object per asset, in this exact format:
+[{{"asset": "<asset>", "direction": "CALL or PUT", "confidence": <1-10>, "reasoning": "<max 30 words>"}}]
+
+Be concise and decisive."""
+
+_BATCH_ASSET_LINE = "- {asset}: price={price}, volume={volume}, timestamp={timestamp}"
+
 
 class TradingLLMIntegration:
     """Integration layer between trading bot and LLM Gateway"""
@@ -17,6 +48,26 @@ class TradingLLMIntegration:
     def __init__(self, llm_gateway_url: str = "http://llm-gateway:8001"):
         self.llm_gateway_url = llm_gateway_url
         self.timeout = httpx.Timeout(30.0)
+        # One pooled client for the lifetime of the integration, so
+        # keep-alive connections to the gateway are reused across calls
+        self._client: Optional[httpx.AsyncClient] = None
+        # A healthy probe is trusted until this monotonic time
+        self._health_ok_until = 0.0
+        self.health_ttl = 5.0
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.llm_gateway_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._client
+    
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def get_trading_recommendation(
         self,
@@ -37,48 +88,136 @@ class TradingLLMIntegration:
         """
         
         # Create structured prompt for trading analysis
-        prompt = f"""Analyze {asset} for binary options trading:
-
-Market Data:
-- Price: {market_data.get('price', 'N/A')}
-- Volume: {market_data.get('volume', 'N/A')}
-- Timestamp: {market_data.get('timestamp', 'N/A')}
-
-Provide a trading recommendation in this exact format:
-DIRECTION: [CALL or PUT]
-CONFIDENCE: [1-10]
-REASONING: [Brief explanation in max 30 words]
-
-Be concise and decisive."""
+        prompt = _RECOMMENDATION_PROMPT.format(
+            asset=asset,
+            price=market_data.get('price', 'N/A'),
+            volume=market_data.get('volume', 'N/A'),
+            timestamp=market_data.get('timestamp', 'N/A')
+        )
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.llm_gateway_url}/completion",
-                    json={
-                        "provider": provider,
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 100
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return self._parse_trading_recommendation(result.get('content', ''))
-                else:
-                    logger.error(f"LLM Gateway error: {response.status_code}")
-                    return self._default_recommendation()
+            response = await self._get_client().post(
+                "/completion",
+                json={
+                    "provider": provider,
+                    "messages": [
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": 100
+                }
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return self._parse_trading_recommendation(result.get('content', ''))
+            else:
+                logger.error(f"LLM Gateway error: {response.status_code}")
+                return self._default_recommendation()
                     
         except Exception as e:
             logger.error(f"Trading recommendation failed: {e}")
             return self._default_recommendation()
     
+    async def get_trading_recommendations_batch(
+        self,
+        items: List[Tuple[str, Dict[str, Any]]],
+        provider: str = "gemini"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get recommendations for several assets with a single LLM request
+        
+        Args:
+            items: (asset, market_data) pairs
+            provider: LLM provider to use
+            
+        Returns:
+            Recommendations keyed by asset; assets missing from the batch answer
+            are fetched individually with get_trading_recommendation
+        """
+        if not items:
+            return {}
+        
+        lines = "\n".join(
+            _BATCH_ASSET_LINE.format(
+                asset=asset,
+                price=market_data.get('price', 'N/A'),
+                volume=market_data.get('volume', 'N/A'),
+                timestamp=market_data.get('timestamp', 'N/A')
+            )
+            for asset, market_data in items
+        )
+        
+        recommendations: Dict[str, Dict[str, Any]] = {}
+        try:
+            response = await self._get_client().post(
+                "/completion",
+                json={
+                    "provider": provider,
+                    "messages": [
+                        {"role": "user", "content": _BATCH_PROMPT.format(assets=lines)}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": 60 * len(items) + 40
+                }
+            )
+            
+            if response.status_code == 200:
+                recommendations = self._parse_batch_recommendations(response.json().get('content', ''))
+            else:
+                logger.error(f"LLM Gateway error: {response.status_code}")
+        except Exception as e:
+            logger.error(f"Batch trading recommendation failed: {e}")
+        
+        missing = [(asset, market_data) for asset, market_data in items if asset not in recommendations]
+        if missing:
+            results = await asyncio.gather(*(
+                self.get_trading_recommendation(asset, market_data, provider)
+                for asset, market_data in missing
+            ))
+            recommendations.update(zip((asset for asset, _ in missing), results))
+        
+        return {asset: recommendations[asset] for asset, _ in items}
+    
+    def _parse_batch_recommendations(self, content: str) -> Dict[str, Dict[str, Any]]:
+        """Parse a JSON array of recommendations, tolerating text or code fences around it"""
+        entries = extract_json(content, '[', ']')
+        if not isinstance(entries, list):
+            logger.warning("Batch recommendation did not contain a JSON array")
+            return {}
+        
+        return {
+            str(entry['asset']): self._recommendation_from_json(entry)
+            for entry in entries
+            if isinstance(entry, dict) and entry.get('asset')
+        }
+    
+    def _recommendation_from_json(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Recommendation fields from a JSON object, with defaults for missing or invalid values"""
+        recommendation = {
+            'direction': 'CALL',
+            'confidence': 5,
+            'reasoning': 'Analysis unavailable',
+        }
+        direction = str(data.get('direction', '')).upper()
+        if direction in ('CALL', 'PUT'):
+            recommendation['direction'] = direction
+        confidence = data.get('confidence')
+        if isinstance(confidence, (int, float)) and 1 <= confidence <= 10:
+            recommendation['confidence'] = int(confidence)
+        if data.get('reasoning'):
+            recommendation['reasoning'] = str(data['reasoning'])
+        return recommendation
+    
     def _parse_trading_recommendation(self, content: str) -> Dict[str, Any]:
         """Parse LLM response into structured recommendation"""
         
+        data = extract_json(content)
+        if isinstance(data, dict):
+            recommendation = self._recommendation_from_json(data)
+            recommendation['raw_response'] = content
+            return recommendation
+        
         recommendation = {
             'direction': 'CALL',  # Default
             'confidence': 5,      # Default
@@ -86,31 +225,17 @@ Be concise and decisive."""
             'raw_response': content
         }
         
-        try:
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if 'DIRECTION:' in line:
-                    direction = line.split(':')[1].strip()
-                    if direction.upper() in ['CALL', 'PUT']:
-                        recommendation['direction'] = direction.upper()
-                        
-                elif 'CONFIDENCE:' in line:
-                    try:
-                        conf_str = line.split(':')[1].strip()
-                        confidence = int(conf_str.split()[0])  # Get just the number
-                        if 1 <= confidence <= 10:
-                            recommendation['confidence'] = confidence
-                    except:
-                        pass
-                        
-                elif 'REASONING:' in line:
-                    reasoning = line.split(':', 1)[1].strip()
-                    if reasoning:
-                        recommendation['reasoning'] = reasoning
-                        
-        except Exception as e:
-            logger.warning(f"Error parsing recommendation: {e}")
+        direction_match = _RE_DIRECTION.search(content)
+        if direction_match:
+            recommendation['direction'] = direction_match.group(1).upper()
+        
+        confidence_match = _RE_CONFIDENCE.search(content)
+        if confidence_match and 1 <= int(confidence_match.group(1)) <= 10:
+            recommendation['confidence'] = int(confidence_match.group(1))
+        
+        reasoning_match = _RE_REASONING.search(content)
+        if reasoning_match:
+            recommendation['reasoning'] = reasoning_match.group(1)
         
         return recommendation
     
@@ -124,13 +249,17 @@ Be concise and decisive."""
         }
     
     async def health_check(self) -> bool:
-        """Check if LLM Gateway is available"""
+        """Check if LLM Gateway is available; a healthy result is reused for health_ttl seconds"""
+        now = time.monotonic()
+        if now < self._health_ok_until:
+            return True
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.llm_gateway_url}/health")
-                return response.status_code == 200
+            response = await self._get_client().get("/health", timeout=5.0)
+            healthy = response.status_code == 200
         except:
-            return False
+            healthy = False
+        self._health_ok_until = now + self.health_ttl if healthy else 0.0
+        return healthy
 
 
 # Global integration instance
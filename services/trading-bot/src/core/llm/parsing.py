@@ -0,0 +1,29 @@
+"""
+Helpers for reading JSON out of LLM responses
+"""
+
+from typing import Any, Optional
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    import json
+    json_loads = json.loads
+
+
+def extract_json(content: str, opening: str = "{", closing: str = "}") -> Optional[Any]:
+    """
+    Parse the outermost JSON object (or array, with "[" and "]") in an LLM response
+
+    Models often wrap JSON in prose or code fences even when told not to, so
+    everything outside the first opening and last closing bracket is ignored.
+    Returns None when no valid JSON is found.
+    """
+    start, end = content.find(opening), content.rfind(closing)
+    if start == -1 or end < start:
+        return None
+    try:
+        return json_loads(content[start:end + 1])
+    except ValueError:
+        return None
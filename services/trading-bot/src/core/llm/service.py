@@ -1,11 +1,46 @@
+import asyncio
 import logging
+import re
+import httpx
 from typing import Dict, Any, Optional
 from abc import ABC, abstractmethod
 from src.models.trading import LLMResponse, TradeDirection
-from config.settings import settings
+from config.settings import get_settings
+from src.core.llm.parsing import extract_json
 
 logger = logging.getLogger(__name__)
 
+# Fields of the text format older prompts requested; used when a model ignores the JSON instruction
+_RE_DECISION = re.compile(r"Decision: (CALL|PUT)")
+_RE_CONFIDENCE = re.compile(r"Confidence: ([0-9.]+)")
+_RE_REASONING = re.compile(r"Reasoning: (.+?)(?=\n|$)")
+_RE_ENTRY = re.compile(r"Entry Price: ([0-9.]+)")
+_RE_STOP = re.compile(r"Stop Loss: ([0-9.]+)")
+_RE_PROFIT = re.compile(r"Take Profit: ([0-9.]+)")
+_RE_TIME_FRAME = re.compile(r"Time Frame: ([0-9]+[mhd])")
+_RE_TIME_FRAME_VALUE = re.compile(r"[0-9]+[mhd]")
+
+_TRADING_PROMPT = """
+        Analyze the following market data for {asset} and provide a trading recommendation:
+
+        Market Data:
+        - Current price: {price}
+        - Timestamp: {timestamp}
+        - Volume: {volume}
+        - Bid: {bid}
+        - Ask: {ask}
+        - Spread: {spread}
+
+        Risk Level: {risk_level} (0.0 = very low risk, 1.0 = very high risk)
+
+        Respond with ONLY this JSON object:
+        {{"decision": "CALL or PUT", "confidence": 0.0 to 1.0, "reasoning": "brief explanation",
+          "entry_price": suggested entry price, "stop_loss": optional stop loss price or null,
+          "take_profit": optional take profit price or null, "time_frame": duration such as "1m", "5m" or "15m"}}
+
+        Keep your response concise and focused on actionable trading advice.
+        """
+
 
 class BaseLLMClient(ABC):
     """
@@ -16,8 +51,11 @@ class BaseLLMClient(ABC):
         pass
 
 
+# The provider SDKs are heavy to import, so each client imports its own SDK in
+# __init__; LLMService builds a single client, so only the configured SDK loads.
 class OpenAILLMClient(BaseLLMClient):
     def __init__(self):
+        settings = get_settings()
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key is not set in settings")
         from openai import AsyncOpenAI
@@ -30,13 +68,15 @@ class OpenAILLMClient(BaseLLMClient):
                 {"role": "system", "content": "You are an expert trading assistant. Provide concise, actionable trading advice based on market data."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.3  # Lower temperature for more consistent responses
+            temperature=0.3,  # Lower temperature for more consistent responses
+            response_format={"type": "json_object"}
         )
         return response.choices[0].message.content
 
 
 class AnthropicLLMClient(BaseLLMClient):
     def __init__(self):
+        settings = get_settings()
         if not settings.anthropic_api_key:
             raise ValueError("Anthropic API key is not set in settings")
         from anthropic import AsyncAnthropic
@@ -57,8 +97,7 @@ class AnthropicLLMClient(BaseLLMClient):
 
 class OllamaLLMClient(BaseLLMClient):
     def __init__(self):
-        import httpx
-        self.base_url = settings.ollama_base_url
+        self.base_url = get_settings().ollama_base_url
         self.http_client = httpx.AsyncClient(timeout=30.0)
 
     async def get_completion(self, prompt: str) -> str:
@@ -67,7 +106,8 @@ class OllamaLLMClient(BaseLLMClient):
             json={
                 "model": "llama3.2",  # Using a lightweight model for local inference
                 "prompt": f"System: You are an expert trading assistant. Provide concise, actionable trading advice based on market data.\n\nUser: {prompt}\n\nAssistant:",
-                "stream": False
+                "stream": False,
+                "format": "json"
             }
         )
         response.raise_for_status()
@@ -76,38 +116,26 @@ class OllamaLLMClient(BaseLLMClient):
 
 class GeminiLLMClient(BaseLLMClient):
     def __init__(self):
+        settings = get_settings()
         if not settings.gemini_api_key:
             raise ValueError("Gemini API key is not set in settings")
         import google.generativeai as genai
         genai.configure(api_key=settings.gemini_api_key)
         self.model = genai.GenerativeModel('gemini-pro')
+        self.generation_config = genai.types.GenerationConfig(temperature=0.3)
         
     async def get_completion(self, prompt: str) -> str:
-        import google.generativeai as genai
-        from google.generativeai.types import generation_types
-        
-        # Note: Gemini doesn't have a native async API, so we'll use a thread executor
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
-        
+        # Gemini doesn't have a native async API, so run the call on the default thread pool
         def sync_generate():
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,
-                )
-            )
+            response = self.model.generate_content(prompt, generation_config=self.generation_config)
             return response.text
-            
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            result = await loop.run_in_executor(executor, sync_generate)
-        return result
+        
+        return await asyncio.to_thread(sync_generate)
 
 
 class LLMService:
     def __init__(self):
-        self.provider = settings.llm_provider
+        self.provider = get_settings().llm_provider
         self.client = self._initialize_client()
 
     def _initialize_client(self) -> BaseLLMClient:
@@ -148,31 +176,16 @@ class LLMService:
         """
         Create a prompt for the LLM with market data
         """
-        prompt = f"""
-        Analyze the following market data for {asset} and provide a trading recommendation:
-
-        Market Data:
-        - Current price: {market_data.get('price', 'N/A')}
-        - Timestamp: {market_data.get('timestamp', 'N/A')}
-        - Volume: {market_data.get('volume', 'N/A')}
-        - Bid: {market_data.get('bid', 'N/A')}
-        - Ask: {market_data.get('ask', 'N/A')}
-        - Spread: {market_data.get('spread', 'N/A')}
-
-        Risk Level: {risk_level} (0.0 = very low risk, 1.0 = very high risk)
-
-        Please provide your analysis in the following format:
-        1. Decision: CALL or PUT
-        2. Confidence: 0.0 to 1.0
-        3. Reasoning: Brief explanation
-        4. Entry Price: Suggested entry price
-        5. Stop Loss: Optional stop loss price
-        6. Take Profit: Optional take profit price
-        7. Time Frame: Duration for the trade (e.g., "1m", "5m", "15m")
-
-        Keep your response concise and focused on actionable trading advice.
-        """
-        return prompt
+        return _TRADING_PROMPT.format(
+            asset=asset,
+            price=market_data.get('price', 'N/A'),
+            timestamp=market_data.get('timestamp', 'N/A'),
+            volume=market_data.get('volume', 'N/A'),
+            bid=market_data.get('bid', 'N/A'),
+            ask=market_data.get('ask', 'N/A'),
+            spread=market_data.get('spread', 'N/A'),
+            risk_level=risk_level
+        )
 
     def _parse_llm_response(self, llm_response: str, market_data: Dict[str, Any]) -> LLMResponse:
         """
@@ -187,7 +200,9 @@ class LLMService:
         # A real implementation would involve processing the llm_response string
         # to extract the required fields
         
-        import re
+        data = extract_json(llm_response)
+        if isinstance(data, dict):
+            return self._parse_json_response(data, llm_response, market_data)
         
         # Mock parsing based on expected format from the prompt
         # This would need to be more robust in a production system
@@ -200,30 +215,31 @@ class LLMService:
         time_frame = "5m"  # Default time frame
         
         # Try to extract values from the response (simplified regex approach)
-        if "Decision: PUT" in llm_response:
+        decision_match = _RE_DECISION.search(llm_response)
+        if decision_match and decision_match.group(1) == "PUT":
             decision = TradeDirection.PUT
         
-        confidence_match = re.search(r"Confidence: ([0-9.]+)", llm_response)
+        confidence_match = _RE_CONFIDENCE.search(llm_response)
         if confidence_match:
             confidence = float(confidence_match.group(1))
         
-        reasoning_match = re.search(r"Reasoning: (.+?)(?=\n|$)", llm_response)
+        reasoning_match = _RE_REASONING.search(llm_response)
         if reasoning_match:
             reasoning = reasoning_match.group(1).strip()
         
-        entry_match = re.search(r"Entry Price: ([0-9.]+)", llm_response)
+        entry_match = _RE_ENTRY.search(llm_response)
         if entry_match:
             entry_price = float(entry_match.group(1))
         
-        stop_match = re.search(r"Stop Loss: ([0-9.]+)", llm_response)
+        stop_match = _RE_STOP.search(llm_response)
         if stop_match:
             stop_loss = float(stop_match.group(1))
         
-        profit_match = re.search(r"Take Profit: ([0-9.]+)", llm_response)
+        profit_match = _RE_PROFIT.search(llm_response)
         if profit_match:
             take_profit = float(profit_match.group(1))
             
-        time_match = re.search(r"Time Frame: ([0-9]+[mhd])", llm_response)
+        time_match = _RE_TIME_FRAME.search(llm_response)
         if time_match:
             time_frame = time_match.group(1)
 
@@ -237,6 +253,28 @@ class LLMService:
             time_frame=time_frame
         )
 
+    def _parse_json_response(self, data: Dict[str, Any], llm_response: str, market_data: Dict[str, Any]) -> LLMResponse:
+        """
+        Build an LLMResponse from the JSON object requested by the prompt,
+        keeping the same defaults as the text parser for missing or invalid fields
+        """
+        def number(value) -> Optional[float]:
+            return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+        
+        confidence = number(data.get('confidence'))
+        entry_price = number(data.get('entry_price'))
+        time_frame = data.get('time_frame')
+        
+        return LLMResponse(
+            decision=TradeDirection.PUT if str(data.get('decision', '')).upper() == "PUT" else TradeDirection.CALL,
+            confidence=confidence if confidence is not None and 0.0 <= confidence <= 1.0 else 0.6,
+            reasoning=str(data.get('reasoning') or llm_response[:100]),
+            entry_price=entry_price if entry_price is not None else market_data.get('price', 0.0),
+            stop_loss=number(data.get('stop_loss')),
+            take_profit=number(data.get('take_profit')),
+            time_frame=time_frame if isinstance(time_frame, str) and _RE_TIME_FRAME_VALUE.fullmatch(time_frame) else "5m"
+        )
+
     async def get_available_providers(self) -> list:
         """
         Get list of available LLM providers
@@ -1,17 +1,71 @@
 """Manifest system for custom indicators, triggers, and news feeds."""
 
 import yaml
-import json
+import functools
 import importlib
 import logging
-from typing import Dict, Any, List, Optional, Type, Callable
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, Any, List, Literal, Optional, Tuple, Type, Callable, Union
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from abc import ABC, abstractmethod
 from enum import Enum
 
+import numpy as np
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Run the decorated kernel as plain Python when numba is unavailable."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 logger = logging.getLogger(__name__)
 
+# Top-level `name:` key, matched against a manifest's first bytes without parsing it
+_RE_MANIFEST_NAME = re.compile(rb'^name:[ \t]*["\']?([^"\'\r\n#]+?)["\']?[ \t]*(?:#[^\r\n]*)?\r?$', re.MULTILINE)
+MANIFEST_HEADER_BYTES = 2048
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a manifest file; mtime_ns and size only key the cache so edited files are re-read."""
+    # Binary mode hands the raw bytes to libyaml, which detects the encoding itself
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def cached_import(module_path: str, class_name: str) -> Any:
+    """Return an attribute of a module, taking the module from sys.modules when it is fully imported."""
+    module = sys.modules.get(module_path)
+    spec = getattr(module, '__spec__', None)
+    if module is None or (spec is not None and getattr(spec, '_initializing', False)):
+        module = importlib.import_module(module_path)
+    return getattr(module, class_name)
+
 
 class ManifestType(str, Enum):
     INDICATOR = "indicator"
@@ -30,7 +84,7 @@ class ManifestBase(BaseModel):
     
 class IndicatorManifest(ManifestBase):
     """Manifest for custom indicators."""
-    type: ManifestType = Field(default=ManifestType.INDICATOR)
+    type: Literal[ManifestType.INDICATOR] = Field(default=ManifestType.INDICATOR)
     implementation: str = Field(..., description="Python module path or class name")
     parameters: Dict[str, Any] = Field(default={}, description="Default parameters")
     inputs: List[str] = Field(default=["close"], description="Required price inputs")
@@ -40,7 +94,7 @@ class IndicatorManifest(ManifestBase):
     
 class TriggerManifest(ManifestBase):
     """Manifest for custom triggers."""
-    type: ManifestType = Field(default=ManifestType.TRIGGER)
+    type: Literal[ManifestType.TRIGGER] = Field(default=ManifestType.TRIGGER)
     implementation: str = Field(..., description="Python module path or class name")
     parameters: Dict[str, Any] = Field(default={}, description="Default parameters")
     conditions: List[str] = Field(..., description="Trigger conditions")
@@ -50,7 +104,7 @@ class TriggerManifest(ManifestBase):
 
 class NewsFeedManifest(ManifestBase):
     """Manifest for custom news feeds."""
-    type: ManifestType = Field(default=ManifestType.NEWS_FEED)
+    type: Literal[ManifestType.NEWS_FEED] = Field(default=ManifestType.NEWS_FEED)
     implementation: str = Field(..., description="Python module path or class name")
     parameters: Dict[str, Any] = Field(default={}, description="Default parameters")
     source_url: Optional[str] = Field(None, description="News source URL")
@@ -59,6 +113,11 @@ class NewsFeedManifest(ManifestBase):
     keywords: List[str] = Field(default=[], description="Keywords to filter news")
 
 
+# One compiled validator dispatching on `type`, instead of picking a model class per file
+ManifestUnion = Annotated[Union[IndicatorManifest, TriggerManifest, NewsFeedManifest], Field(discriminator='type')]
+_manifest_adapter = TypeAdapter(ManifestUnion)
+
+
 class BaseIndicator(ABC):
     """Base class for custom indicators."""
     
@@ -87,6 +146,18 @@ class BaseTrigger(ABC):
     def evaluate(self, market_data: Dict[str, Any], indicators: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate trigger conditions."""
         pass
+    
+    @staticmethod
+    def _get_series(market_data: Dict[str, Any], field: str) -> np.ndarray:
+        """Return a candle field (e.g. 'close') as a float64 array.
+        
+        Uses the precomputed array under the plural key ('closes') when the
+        caller provides one, otherwise builds it from the candle dicts.
+        """
+        series = market_data.get(f"{field}s")
+        if series is None:
+            series = [candle[field] for candle in market_data.get('candles', [])]
+        return np.asarray(series, dtype=np.float64)
 
 
 class BaseNewsFeed(ABC):
@@ -113,36 +184,53 @@ class ManifestLoader:
     def __init__(self):
         self.loaded_manifests: Dict[str, Any] = {}
         self.loaded_components: Dict[str, Any] = {}
+        # Validated manifests keyed by path, with the (mtime, size) they were parsed at
+        self._manifest_cache: Dict[str, Tuple[Tuple[int, int], ManifestBase]] = {}
+        # Manifests found by scan_manifests but not parsed until first requested through get()
+        self._pending: Dict[str, Path] = {}
+        # Files that failed to load, keyed by path with the (mtime, size) and error they failed with
+        self._bad_files: Dict[str, Tuple[Tuple[int, int], str]] = {}
     
     def load_manifest_from_file(self, file_path: str) -> Optional[ManifestBase]:
-        """Load manifest from YAML file."""
+        """Load manifest from YAML file, reusing the parsed result while the file is unchanged."""
+        version = None
         try:
-            path = Path(file_path)
-            if not path.exists():
+            path = os.path.abspath(file_path)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
                 logger.error(f"Manifest file not found: {file_path}")
                 return None
+            version = (stat.st_mtime_ns, stat.st_size)
             
-            with open(path, 'r') as f:
-                data = yaml.safe_load(f)
+            cached = self._manifest_cache.get(path)
+            if cached is not None and cached[0] == version:
+                manifest = cached[1]
+                self.loaded_manifests[manifest.name] = manifest
+                return manifest
             
-            # Determine manifest type and create appropriate object
-            manifest_type = data.get('type')
-            if manifest_type == ManifestType.INDICATOR:
-                manifest = IndicatorManifest(**data)
-            elif manifest_type == ManifestType.TRIGGER:
-                manifest = TriggerManifest(**data)
-            elif manifest_type == ManifestType.NEWS_FEED:
-                manifest = NewsFeedManifest(**data)
-            else:
-                logger.error(f"Unknown manifest type: {manifest_type}")
+            # A broken file is only re-parsed (and re-logged) once it changes
+            bad = self._bad_files.get(path)
+            if bad is not None and bad[0] == version:
+                logger.debug(f"Skipping unchanged invalid manifest {file_path}: {bad[1]}")
                 return None
             
+            # The raw dict is shared across loaders; models are validated per loader
+            # so mutable field defaults are never shared between them
+            data = _parse_yaml(path, *version)
+            
+            manifest = _manifest_adapter.validate_python(data)
+            
+            self._manifest_cache[path] = (version, manifest)
+            self._bad_files.pop(path, None)
             self.loaded_manifests[manifest.name] = manifest
             logger.info(f"Loaded manifest: {manifest.name} ({manifest.type})")
             return manifest
             
         except Exception as e:
             logger.error(f"Error loading manifest from {file_path}: {e}")
+            if version is not None:
+                self._bad_files[path] = (version, str(e))
             return None
     
     def load_component(self, manifest: ManifestBase) -> Optional[Any]:
@@ -156,8 +244,7 @@ class ManifestLoader:
             if '.' in manifest.implementation:
                 # Module path
                 module_path, class_name = manifest.implementation.rsplit('.', 1)
-                module = importlib.import_module(module_path)
-                component_class = getattr(module, class_name)
+                component_class = cached_import(module_path, class_name)
             else:
                 # Assume it's a class name in current context
                 # This is for built-in components
@@ -201,6 +288,49 @@ class ManifestLoader:
         
         return None
     
+    def scan_manifests(self, directory: str) -> List[str]:
+        """Register manifests in a directory by name without parsing them; get() loads them on demand."""
+        directory_path = Path(directory)
+        if not directory_path.exists():
+            logger.warning(f"Manifest directory not found: {directory}")
+            return []
+        
+        names = []
+        for path in sorted(directory_path.iterdir()):
+            if path.suffix not in ('.yml', '.yaml'):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    header = f.read(MANIFEST_HEADER_BYTES)
+            except OSError as e:
+                logger.error(f"Error reading manifest header from {path}: {e}")
+                continue
+            
+            match = _RE_MANIFEST_NAME.search(header)
+            if match is None:
+                logger.warning(f"No top-level name found in manifest header: {path}")
+                continue
+            name = match.group(1).decode('utf-8', errors='replace')
+            if name not in self.loaded_manifests:
+                self._pending[name] = path
+            names.append(name)
+        return names
+    
+    def get(self, name: str) -> Optional[ManifestBase]:
+        """Return a manifest by name, parsing and validating a scanned file on first access."""
+        manifest = self.loaded_manifests.get(name)
+        if manifest is not None:
+            return manifest
+        
+        path = self._pending.pop(name, None)
+        if path is None:
+            return None
+        
+        manifest = self.load_manifest_from_file(str(path))
+        if manifest is not None and manifest.name != name:
+            logger.warning(f"Manifest {path} was registered as {name} but declares {manifest.name}")
+        return manifest
+    
     def load_all_manifests(self, directory: str) -> List[ManifestBase]:
         """Load all manifests from a directory."""
         manifests = []
@@ -210,20 +340,121 @@ class ManifestLoader:
             logger.warning(f"Manifest directory not found: {directory}")
             return manifests
         
-        # Find all YAML files
-        for yaml_file in directory_path.glob("*.yml"):
-            manifest = self.load_manifest_from_file(str(yaml_file))
-            if manifest:
-                manifests.append(manifest)
+        # One directory scan for both extensions
+        paths = sorted(str(p) for p in directory_path.iterdir() if p.suffix in ('.yml', '.yaml'))
         
-        for yaml_file in directory_path.glob("*.yaml"):
-            manifest = self.load_manifest_from_file(str(yaml_file))
-            if manifest:
-                manifests.append(manifest)
+        # libyaml releases the GIL while parsing, so file reads and parses overlap across threads
+        with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as executor:
+            results = list(executor.map(self.load_manifest_from_file, paths))
         
+        manifests.extend(manifest for manifest in results if manifest)
         return manifests
 
 
+@njit(cache=True)
+def _smooth_kernel(values, alpha, initial):
+    """Compiled loop behind _recursive_smooth, used when numba is installed."""
+    smoothed = np.empty_like(values)
+    decay = 1 - alpha
+    previous = initial
+    for i in range(values.shape[0]):
+        previous = alpha * values[i] + decay * previous
+        smoothed[i] = previous
+    return smoothed
+
+
+def _recursive_smooth(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """Apply y[i] = alpha * x[i] + (1 - alpha) * y[i-1], starting from y[-1] = initial."""
+    if HAS_NUMBA:
+        return _smooth_kernel(np.ascontiguousarray(values, dtype=np.float64), alpha, float(initial))
+    
+    if lfilter is not None:
+        smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1 - alpha) * initial])
+        return smoothed
+    
+    # Plain Python floats throughout; NumPy scalars would make every step several times slower
+    smoothed = []
+    append = smoothed.append
+    decay = 1 - alpha
+    previous = float(initial)
+    for value in values.tolist():
+        previous = alpha * value + decay * previous
+        append(previous)
+    return np.array(smoothed)
+
+
+def _rolling_mean_std(prices: np.ndarray, period: int):
+    """Mean and population std of every full window, in O(N) from cumulative sums.
+    
+    Prices are centred on their overall mean first so the difference of
+    cumulative squares keeps its precision.
+    """
+    offset = prices.mean()
+    centred = prices - offset
+    sums = np.concatenate(([0.0], np.cumsum(centred)))
+    squares = np.concatenate(([0.0], np.cumsum(centred * centred)))
+    mean = (sums[period:] - sums[:-period]) / period
+    variance = (squares[period:] - squares[:-period]) / period - mean * mean
+    return mean + offset, np.sqrt(np.maximum(variance, 0.0))
+
+
+def _ema(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA seeded with the simple average of the first period; one value per full window."""
+    if len(values) < period:
+        return np.empty(0)
+    # sum / period is what mean() computes, minus its dispatch overhead on short series
+    seed = values[:period].sum() / period
+    ema = np.empty(len(values) - period + 1)
+    ema[0] = seed
+    ema[1:] = _recursive_smooth(values[period:], 2 / (period + 1), seed)
+    return ema
+
+
+@njit(cache=True)
+def _macd_kernel(prices, fast_period, slow_period, signal_period):
+    """Compute MACD, signal and histogram in a single pass over the prices.
+    
+    Each EMA is seeded with the simple average of its first period. The MACD
+    line starts once the slow EMA is available and the signal line once it has
+    signal_period MACD values; the histogram is aligned with the signal line.
+    """
+    fast_alpha = 2.0 / (fast_period + 1)
+    slow_alpha = 2.0 / (slow_period + 1)
+    signal_alpha = 2.0 / (signal_period + 1)
+    
+    macd_count = prices.shape[0] - slow_period + 1
+    signal_count = max(macd_count - signal_period + 1, 0)
+    macd = np.empty(macd_count)
+    signal = np.empty(signal_count)
+    histogram = np.empty(signal_count)
+    
+    fast_ema = prices[:fast_period].mean()
+    for i in range(fast_period, slow_period):
+        fast_ema = fast_alpha * prices[i] + (1 - fast_alpha) * fast_ema
+    slow_ema = prices[:slow_period].mean()
+    
+    signal_ema = 0.0
+    for j in range(macd_count):
+        if j > 0:
+            price = prices[slow_period - 1 + j]
+            fast_ema = fast_alpha * price + (1 - fast_alpha) * fast_ema
+            slow_ema = slow_alpha * price + (1 - slow_alpha) * slow_ema
+        macd[j] = fast_ema - slow_ema
+        
+        k = j - signal_period + 1
+        if k < 0:
+            signal_ema += macd[j]
+            continue
+        if k == 0:
+            signal_ema = (signal_ema + macd[j]) / signal_period
+        else:
+            signal_ema = signal_alpha * macd[j] + (1 - signal_alpha) * signal_ema
+        signal[k] = signal_ema
+        histogram[k] = macd[j] - signal_ema
+    
+    return macd, signal, histogram
+
+
 # Built-in Indicator Implementations
 class RSIIndicator(BaseIndicator):
     """Relative Strength Index indicator."""
@@ -234,33 +465,23 @@ class RSIIndicator(BaseIndicator):
         if len(data) < period + 1:
             return {"rsi": []}
         
-        # Calculate price changes
-        deltas = [data[i] - data[i-1] for i in range(1, len(data))]
+        prices = np.asarray(data, dtype=np.float64)
         
         # Separate gains and losses
-        gains = [max(delta, 0) for delta in deltas]
-        losses = [abs(min(delta, 0)) for delta in deltas]
-        
-        rsi_values = []
+        deltas = np.diff(prices)
+        # max(d, 0) - d == max(-d, 0) exactly, without negating into a temporary
+        gains = np.maximum(deltas, 0.0)
+        losses = gains - deltas
         
-        # Calculate initial averages
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
+        # Wilder smoothing, seeded with the simple average of the first period
+        alpha = 1 / period
+        avg_gain = _recursive_smooth(gains[period:], alpha, gains[:period].mean())
+        avg_loss = _recursive_smooth(losses[period:], alpha, losses[:period].mean())
         
-        for i in range(period, len(gains)):
-            # Smoothed averages
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
         
-        return {"rsi": rsi_values}
+        return {"rsi": rsi.tolist()}
 
 
 class MACDIndicator(BaseIndicator):
@@ -274,45 +495,22 @@ class MACDIndicator(BaseIndicator):
         if len(data) < slow_period:
             return {"macd": [], "signal": [], "histogram": []}
         
-        # Calculate EMAs
-        fast_ema = self._calculate_ema(data, fast_period)
-        slow_ema = self._calculate_ema(data, slow_period)
+        prices = np.asarray(data, dtype=np.float64)
         
-        # Calculate MACD line
-        min_length = min(len(fast_ema), len(slow_ema))
-        macd_line = [fast_ema[i] - slow_ema[i] for i in range(min_length)]
-        
-        # Calculate Signal line (EMA of MACD)
-        signal_line = self._calculate_ema(macd_line, signal_period)
-        
-        # Calculate Histogram
-        min_length = min(len(macd_line), len(signal_line))
-        histogram = [macd_line[i] - signal_line[i] for i in range(min_length)]
+        if HAS_NUMBA:
+            macd_line, signal_line, histogram = _macd_kernel(prices, fast_period, slow_period, signal_period)
+        else:
+            # Without numba the kernel is a Python loop; whole-array EMAs are faster
+            slow_ema = _ema(prices, slow_period)
+            macd_line = _ema(prices, fast_period)[-len(slow_ema):] - slow_ema
+            signal_line = _ema(macd_line, signal_period)
+            histogram = macd_line[signal_period - 1:] - signal_line
         
         return {
-            "macd": macd_line,
-            "signal": signal_line,
-            "histogram": histogram
+            "macd": macd_line.tolist(),
+            "signal": signal_line.tolist(),
+            "histogram": histogram.tolist()
         }
-    
-    def _calculate_ema(self, data: List[float], period: int) -> List[float]:
-        """Calculate Exponential Moving Average."""
-        if len(data) < period:
-            return []
-        
-        multiplier = 2 / (period + 1)
-        ema_values = []
-        
-        # Start with SMA for first value
-        sma = sum(data[:period]) / period
-        ema_values.append(sma)
-        
-        # Calculate EMA for remaining values
-        for i in range(period, len(data)):
-            ema = (data[i] * multiplier) + (ema_values[-1] * (1 - multiplier))
-            ema_values.append(ema)
-        
-        return ema_values
 
 
 class BollingerBandsIndicator(BaseIndicator):
@@ -325,26 +523,19 @@ class BollingerBandsIndicator(BaseIndicator):
         if len(data) < period:
             return {"upper": [], "middle": [], "lower": []}
         
-        upper_band = []
-        middle_band = []
-        lower_band = []
+        prices = np.asarray(data, dtype=np.float64)
         
-        for i in range(period - 1, len(data)):
-            # Calculate SMA (middle band)
-            sma = sum(data[i-period+1:i+1]) / period
-            
-            # Calculate standard deviation
-            variance = sum((x - sma) ** 2 for x in data[i-period+1:i+1]) / period
-            std = variance ** 0.5
-            
-            upper_band.append(sma + (std_dev * std))
-            middle_band.append(sma)
-            lower_band.append(sma - (std_dev * std))
+        if bn is not None:
+            # O(N) incremental moving window; leading entries are NaN until the window fills
+            middle = bn.move_mean(prices, window=period)[period - 1:]
+            std = bn.move_std(prices, window=period, ddof=0)[period - 1:]
+        else:
+            middle, std = _rolling_mean_std(prices, period)
         
         return {
-            "upper": upper_band,
-            "middle": middle_band,
-            "lower": lower_band
+            "upper": (middle + std_dev * std).tolist(),
+            "middle": middle.tolist(),
+            "lower": (middle - std_dev * std).tolist()
         }
 
 
@@ -357,12 +548,14 @@ class SMAIndicator(BaseIndicator):
         if len(data) < period:
             return {"sma": []}
         
-        sma_values = []
-        for i in range(period - 1, len(data)):
-            sma = sum(data[i-period+1:i+1]) / period
-            sma_values.append(sma)
+        prices = np.asarray(data, dtype=np.float64)
+        
+        # O(N) difference of cumulative sums, centred like _rolling_mean_std for precision
+        offset = prices.mean()
+        sums = np.concatenate(([0.0], np.cumsum(prices - offset)))
+        sma_values = (sums[period:] - sums[:-period]) / period + offset
         
-        return {"sma": sma_values}
+        return {"sma": sma_values.tolist()}
 
 
 class EMAIndicator(BaseIndicator):
@@ -374,19 +567,10 @@ class EMAIndicator(BaseIndicator):
         if len(data) < period:
             return {"ema": []}
         
-        multiplier = 2 / (period + 1)
-        ema_values = []
+        prices = np.asarray(data, dtype=np.float64)
         
-        # Start with SMA
-        sma = sum(data[:period]) / period
-        ema_values.append(sma)
-        
-        # Calculate EMA
-        for i in range(period, len(data)):
-            ema = (data[i] * multiplier) + (ema_values[-1] * (1 - multiplier))
-            ema_values.append(ema)
-        
-        return {"ema": ema_values}
+        # Start with SMA, then smooth the remaining prices with the EMA multiplier
+        return {"ema": _ema(prices, period).tolist()}
 
 
 # Built-in Trigger Implementations
@@ -395,15 +579,15 @@ class PriceActionTrigger(BaseTrigger):
     
     def evaluate(self, market_data: Dict[str, Any], indicators: Dict[str, Any]) -> Dict[str, Any]:
         # Simple price action logic
-        candles = market_data.get('candles', [])
-        if len(candles) < 3:
+        closes = self._get_series(market_data, 'close')
+        if len(closes) < 3:
             return {"action": "HOLD", "confidence": 0.0, "reason": "Insufficient data"}
         
-        # Get last 3 candles
-        recent_candles = candles[-3:]
+        # Close-to-close changes over the last 3 candles
+        changes = np.diff(closes[-3:])
         
         # Bullish pattern: 3 consecutive higher closes
-        if all(recent_candles[i]['close'] > recent_candles[i-1]['close'] for i in range(1, 3)):
+        if (changes > 0).all():
             return {
                 "action": "BUY",
                 "confidence": 0.7,
@@ -411,7 +595,7 @@ class PriceActionTrigger(BaseTrigger):
             }
         
         # Bearish pattern: 3 consecutive lower closes
-        if all(recent_candles[i]['close'] < recent_candles[i-1]['close'] for i in range(1, 3)):
+        if (changes < 0).all():
             return {
                 "action": "SELL", 
                 "confidence": 0.7,
@@ -425,22 +609,20 @@ class VolumeSpikeTrigger(BaseTrigger):
     """Volume spike based trigger."""
     
     def evaluate(self, market_data: Dict[str, Any], indicators: Dict[str, Any]) -> Dict[str, Any]:
-        candles = market_data.get('candles', [])
-        if len(candles) < 20:
+        volumes = self._get_series(market_data, 'volume')
+        if len(volumes) < 20:
             return {"action": "HOLD", "confidence": 0.0, "reason": "Insufficient data"}
         
         # Calculate average volume over last 20 periods
-        volumes = [candle['volume'] for candle in candles[-20:]]
-        avg_volume = sum(volumes) / len(volumes)
-        
-        current_volume = candles[-1]['volume']
-        current_close = candles[-1]['close'] 
-        previous_close = candles[-2]['close']
+        avg_volume = volumes[-20:].mean()
+        current_volume = volumes[-1]
         
         # Volume spike threshold
         spike_threshold = self.parameters.get('spike_threshold', 2.0)
         
         if current_volume > avg_volume * spike_threshold:
+            # Closes are only needed to tell the direction of a spike
+            previous_close, current_close = self._get_series(market_data, 'close')[-2:]
             if current_close > previous_close:
                 return {
                     "action": "BUY",
@@ -1,17 +1,23 @@
 import logging
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from src.models.trading import MarketData
-from datetime import datetime
+import time
 
 logger = logging.getLogger(__name__)
 
 
 class MarketService:
+    # Seconds a pushed tick is served for; older ticks fall back to a fresh fetch
+    MAX_TICK_AGE = 5.0
+
     def __init__(self):
         # In a real implementation, this would connect to market data providers
         self.data_sources = {}
         self.is_running = False
+        # Latest tick per asset with its monotonic publish time, pushed by providers through publish_tick
+        self._latest: Dict[str, Tuple[float, MarketData]] = {}
+        self._tick = asyncio.Event()
 
     async def startup(self):
         """
@@ -19,8 +25,7 @@ class MarketService:
         """
         logger.info("Initializing market data service...")
         self.is_running = True
-        # Start background tasks to fetch market data
-        asyncio.create_task(self._fetch_market_data_loop())
+        self._tick = asyncio.Event()
 
     async def shutdown(self):
         """
@@ -28,11 +33,35 @@ class MarketService:
         """
         logger.info("Shutting down market data service...")
         self.is_running = False
+        # Release anyone still waiting for a tick
+        self._tick.set()
+
+    def publish_tick(self, data: MarketData):
+        """
+        Store a pushed tick and wake every consumer waiting in wait_tick
+        """
+        self._latest[data.asset] = (time.monotonic(), data)
+        tick, self._tick = self._tick, asyncio.Event()
+        tick.set()
+
+    async def wait_tick(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the next tick is published; returns False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._tick.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.is_running
 
     async def get_market_data(self, asset: str) -> MarketData:
         """
         Get current market data for an asset
         """
+        latest = self._latest.get(asset)
+        if latest is not None and time.monotonic() - latest[0] <= self.MAX_TICK_AGE:
+            return latest[1]
+        
         # In a real implementation, this would fetch from a real market data provider
         # For now, we'll return mock data
         mock_price = 1.2345  # Example price
@@ -40,22 +69,9 @@ class MarketService:
         return MarketData(
             asset=asset,
             price=mock_price,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             volume=1000.0,
             bid=mock_price - 0.0001,
             ask=mock_price + 0.0001,
             spread=0.0002
         )
-
-    async def _fetch_market_data_loop(self):
-        """
-        Background task to continuously fetch market data
-        """
-        while self.is_running:
-            try:
-                # Update cache with latest market data
-                # This would connect to real market data APIs in production
-                await asyncio.sleep(1)  # Update every second
-            except Exception as e:
-                logger.error(f"Error in market data fetch loop: {str(e)}")
-                await asyncio.sleep(5)  # Wait before retrying
\ No newline at end of file
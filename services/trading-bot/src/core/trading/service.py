@@ -1,17 +1,17 @@
 import logging
 from typing import List, Optional
-from datetime import datetime
+import time
 from uuid import uuid4
 from src.models.trading import TradeRequest, TradeResponse, TradeStatus, LLMResponse, TradeDirection
 from src.integrations.iq_option.service import IQOptionService
-from config.settings import settings
+from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 
 class TradingService:
-    def __init__(self):
-        self.iq_option_service = IQOptionService()
+    def __init__(self, iq_option_service: Optional[IQOptionService] = None):
+        self.iq_option_service = iq_option_service or IQOptionService()
         self.risk_manager = RiskManager()
 
     async def execute_trade(
@@ -44,7 +44,7 @@ class TradingService:
                 entry_price=llm_decision.entry_price,
                 status=TradeStatus.EXECUTED if trade_result["success"] else TradeStatus.CANCELLED,
                 profit=trade_result.get("profit"),
-                created_at=datetime.utcnow()
+                created_at=time.time_ns()
             )
 
             # Log the trade
@@ -72,6 +72,7 @@ class RiskManager:
     Manages risk for trading decisions
     """
     def __init__(self):
+        settings = get_settings()
         self.daily_pnl = 0.0
         self.daily_loss_limit = settings.max_daily_risk
         self.trade_risk_limit = settings.default_risk_per_trade
@@ -7,13 +7,13 @@ Handles tasks like:
 """
 import asyncio
 import logging
-from config.settings import settings
+from config.settings import get_settings
 from src.core.market.service import MarketService
 from src.core.trading.service import TradingService
 from src.core.llm.service import LLMService
 
 # Set up logging
-logging.basicConfig(level=settings.log_level.upper())
+logging.basicConfig(level=get_settings().log_level.upper())
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +38,8 @@ async def main():
             # market_data = await market_service.get_market_data("EURUSD")
             # logger.info(f"Current EURUSD price: {market_data.price}")
             
-            await asyncio.sleep(30)  # Run every 30 seconds
+            # Wake on the next market tick, or every 30 seconds at the latest
+            await market_service.wait_tick(timeout=30)
             
     except KeyboardInterrupt:
         logger.info("Worker interrupted by user")
@@ -4,10 +4,9 @@ import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, time, timedelta
-import json
 from pathlib import Path
 
-from src.config.trading_config import config_parser, TradingConfig
+from src.config.trading_config import get_config_parser, TradingConfig
 from src.integrations.iq_option.service import IQOptionService
 from src.integrations.chart_data import ChartData
 from src.core.manifests import (
@@ -22,7 +21,7 @@ class TradingAgent:
     """Main trading agent that manages the entire trading process."""
     
     def __init__(self):
-        self.config = config_parser.get_trading_config()
+        self.config = get_config_parser().get_trading_config()
         self.iq_service = IQOptionService()
         self.indicators: Dict[str, BaseIndicator] = {}
         self.triggers: Dict[str, BaseTrigger] = {}
@@ -230,14 +229,16 @@ class TradingAgent:
             if not chart_data or not chart_data.candles:
                 continue
                 
-            # Prepare price data
-            closes = [candle.close for candle in chart_data.candles]
-            volumes = [candle.volume for candle in chart_data.candles]
+            # Prepare price data (arrays are built once per ChartData and shared)
+            closes = chart_data.closes
+            volumes = chart_data.volumes
             
             market_data[timeframe] = {
                 'candles': [candle.to_dict() for candle in chart_data.candles],
                 'closes': closes,
-                'volumes': volumes
+                'volumes': volumes,
+                'highs': chart_data.highs,
+                'lows': chart_data.lows
             }
             
             # Calculate indicators
@@ -2,11 +2,14 @@
 
 import asyncio
 import logging
-import json
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,9 @@ class Timeframe(Enum):
     D1 = 86400   # 1 day
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+
 @dataclass
 class Candle:
     """Individual price candle data."""
@@ -30,7 +36,12 @@ class Candle:
     low: float  
     close: float
     volume: float
-    timestamp: datetime
+    timestamp_ns: int  # Open time in nanoseconds since the Unix epoch (UTC)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Open time as a naive UTC datetime, built on demand."""
+        return _EPOCH + timedelta(microseconds=self.timestamp_ns // 1000)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -51,6 +62,37 @@ class ChartData:
     candles: List[Candle]
     last_update: datetime
     
+    @cached_property
+    def _series(self) -> np.ndarray:
+        """Candle fields as contiguous rows: open, high, low, close, volume."""
+        rows = [(c.open, c.high, c.low, c.close, c.volume) for c in self.candles]
+        return np.array(rows, dtype=np.float64).reshape(-1, 5).T.copy()
+    
+    @cached_property
+    def timestamps_ns(self) -> np.ndarray:
+        """Candle open times as int64 nanoseconds since the Unix epoch."""
+        return np.fromiter((c.timestamp_ns for c in self.candles), dtype=np.int64, count=len(self.candles))
+    
+    @property
+    def opens(self) -> np.ndarray:
+        return self._series[0]
+    
+    @property
+    def highs(self) -> np.ndarray:
+        return self._series[1]
+    
+    @property
+    def lows(self) -> np.ndarray:
+        return self._series[2]
+    
+    @property
+    def closes(self) -> np.ndarray:
+        return self._series[3]
+    
+    @property
+    def volumes(self) -> np.ndarray:
+        return self._series[4]
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "asset": self.asset,
@@ -64,6 +106,15 @@ class ChartData:
 class ChartDataService:
     """Service for fetching real chart data from IQ Option."""
     
+    _instance: Optional["ChartDataService"] = None
+    
+    @classmethod
+    def instance(cls) -> "ChartDataService":
+        """Shared service without an API binding, so its candle cache is reused across callers."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
     def __init__(self, iq_api=None):
         self.iq_api = iq_api
         self.supported_assets = [
@@ -75,15 +126,23 @@ class ChartDataService:
             "SPX500", "NDQ100", "DAX30", "FTSE100", "NIKKEI225"
         ]
         self.cache: Dict[str, ChartData] = {}
-        self.cache_duration = timedelta(minutes=1)  # Cache for 1 minute
+        self.cache_duration = timedelta(minutes=1)  # Cache for at most 1 minute
+        self.cache_period_fraction = 0.1  # ...or a tenth of the candle period, if shorter
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.max_concurrent_fetches = 16  # Cap fan-out to stay under API rate limits
+    
+    def _get_cache_key(self, asset: str, timeframe: str, count: int) -> str:
+        """Generate cache key for asset, timeframe and candle count combination."""
+        return f"{asset}_{timeframe}_{count}"
     
-    def _get_cache_key(self, asset: str, timeframe: str) -> str:
-        """Generate cache key for asset and timeframe combination."""
-        return f"{asset}_{timeframe}"
+    def _cache_ttl(self, timeframe: str) -> timedelta:
+        """How long data for a timeframe stays fresh: a fraction of the candle period, capped."""
+        period = timedelta(seconds=Timeframe[timeframe].value * self.cache_period_fraction)
+        return min(self.cache_duration, period)
     
     def _is_cache_valid(self, chart_data: ChartData) -> bool:
         """Check if cached data is still valid."""
-        return (datetime.utcnow() - chart_data.last_update) < self.cache_duration
+        return (datetime.utcnow() - chart_data.last_update) < self._cache_ttl(chart_data.timeframe)
     
     async def get_chart_data(
         self, 
@@ -104,7 +163,7 @@ class ChartDataService:
         Returns:
             ChartData object or None if fetch fails
         """
-        cache_key = self._get_cache_key(asset, timeframe)
+        cache_key = self._get_cache_key(asset, timeframe, count)
         
         # Check cache first
         if not force_refresh and cache_key in self.cache:
@@ -113,6 +172,22 @@ class ChartDataService:
                 logger.debug(f"Returning cached data for {asset} {timeframe}")
                 return cached_data
         
+        # Concurrent misses for the same key share a single fetch
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_chart_data(asset, timeframe, count, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return await asyncio.shield(task)
+    
+    async def _fetch_chart_data(
+        self, 
+        asset: str, 
+        timeframe: str, 
+        count: int, 
+        cache_key: str
+    ) -> Optional[ChartData]:
+        """Fetch chart data from the API (or mock source) and cache it."""
         # Validate asset
         if asset not in self.supported_assets:
             logger.warning(f"Unsupported asset: {asset}")
@@ -182,9 +257,12 @@ class ChartDataService:
         tf_seconds = Timeframe[timeframe].value
         base_price = self._get_base_price(asset)
         
+        now_ns = time.time_ns()
+        tf_ns = tf_seconds * 1_000_000_000
+        
         # Generate candles going backwards in time
         for i in range(count):
-            timestamp = datetime.utcnow() - timedelta(seconds=tf_seconds * (count - i))
+            timestamp_ns = now_ns - tf_ns * (count - i)
             
             # Generate realistic price movement
             volatility = 0.002  # 0.2% volatility
@@ -204,7 +282,7 @@ class ChartDataService:
                 low=round(low_price, 5),
                 close=round(close_price, 5),
                 volume=round(volume, 2),
-                timestamp=timestamp
+                timestamp_ns=timestamp_ns
             )
             candles.append(candle)
             base_price = close_price  # Use close as next base
@@ -240,21 +318,19 @@ class ChartDataService:
         Returns:
             Nested dict: {asset: {timeframe: ChartData}}
         """
-        results = {}
-        
-        # Create tasks for concurrent fetching
-        tasks = []
-        asset_tf_pairs = []
+        results = {asset: {} for asset in assets}
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
         
-        for asset in assets:
-            results[asset] = {}
-            for timeframe in timeframes:
-                task = self.get_chart_data(asset, timeframe, count)
-                tasks.append(task)
-                asset_tf_pairs.append((asset, timeframe))
+        async def fetch(asset: str, timeframe: str) -> Optional[ChartData]:
+            async with semaphore:
+                return await self.get_chart_data(asset, timeframe, count)
         
-        # Execute all tasks concurrently
-        chart_data_list = await asyncio.gather(*tasks, return_exceptions=True)
+        # Fetch every (asset, timeframe) pair concurrently
+        asset_tf_pairs = [(asset, timeframe) for asset in assets for timeframe in timeframes]
+        chart_data_list = await asyncio.gather(
+            *(fetch(asset, timeframe) for asset, timeframe in asset_tf_pairs),
+            return_exceptions=True
+        )
         
         # Process results
         for (asset, timeframe), chart_data in zip(asset_tf_pairs, chart_data_list):
@@ -24,8 +24,8 @@ except ImportError:
 
 from src.models.trading import TradeResponse, TradeDirection, TradeStatus
 from src.integrations.chart_data import ChartData, Candle, Timeframe
-from src.config.trading_config import config_parser
-from config.settings import settings
+from src.config.trading_config import get_config_parser
+from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +93,7 @@ class IQOptionRealAPI:
             return False
             
         try:
+            settings = get_settings()
             self.api = IQ_Option(
                 settings.iq_option_email,
                 settings.iq_option_password
@@ -122,7 +123,7 @@ class IQOptionRealAPI:
             self.account_balance = float(balance)
             
             # Check if we're in practice mode
-            config = config_parser.get_iq_option_config()
+            config = get_config_parser().get_iq_option_config()
             if config.demo_mode:
                 await loop.run_in_executor(
                     self.executor, self.api.change_balance, "PRACTICE"
@@ -236,12 +237,12 @@ class IQOptionRealAPI:
                     low=float(candle_data['min']),
                     close=float(candle_data['close']),
                     volume=float(candle_data.get('volume', 0)),
-                    timestamp=datetime.fromtimestamp(candle_data['from'])
+                    timestamp_ns=int(candle_data['from']) * 1_000_000_000
                 )
                 candles.append(candle)
             
             # Sort by timestamp
-            candles.sort(key=lambda x: x.timestamp)
+            candles.sort(key=lambda x: x.timestamp_ns)
             
             logger.debug(f"Successfully fetched {len(candles)} candles for {asset}")
             return candles
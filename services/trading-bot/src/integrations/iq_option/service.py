@@ -1,9 +1,10 @@
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from src.models.trading import TradeResponse, TradeDirection, TradeStatus
 from src.integrations.chart_data import ChartDataService, ChartData
 from src.integrations.iq_option.real_api import IQOptionRealAPI
-from src.config.trading_config import config_parser
+from src.config.trading_config import get_config_parser
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -13,16 +14,16 @@ class IQOptionService:
     def __init__(self, use_real_api: bool = True):
         self.connected = False
         self.session = None
-        self.chart_service = ChartDataService()
-        self.config = config_parser.get_iq_option_config()
+        self.config = get_config_parser().get_iq_option_config()
         self.use_real_api = use_real_api
         
         if use_real_api:
             self.real_api = IQOptionRealAPI()
-            # Connect real API to chart service
-            self.chart_service.iq_api = self.real_api
+            # Connect real API to a chart service of our own
+            self.chart_service = ChartDataService(self.real_api)
         else:
             self.real_api = None
+            self.chart_service = ChartDataService.instance()
             logger.info("Using mock IQ Option service")
 
     async def connect(self):
@@ -219,6 +220,27 @@ class IQOptionService:
                 "ask": round(price + 0.0001, 5)
             }
 
+    async def get_asset_snapshot(self, assets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get market status and a real-time quote for several assets at once.
+        
+        Both lookups for every asset run concurrently.
+        
+        Args:
+            assets: List of asset symbols
+            
+        Returns:
+            Dict: {asset: {"market_open": bool, "quote": quote dict or None}}
+        """
+        results = await asyncio.gather(*(
+            asyncio.gather(self.is_market_open(asset), self.get_real_time_quote(asset))
+            for asset in assets
+        ))
+        return {
+            asset: {"market_open": market_open, "quote": quote}
+            for asset, (market_open, quote) in zip(assets, results)
+        }
+
     async def get_chart_data(
         self, 
         asset: str, 
@@ -107,22 +107,25 @@ REASONING: [Your brief analysis]"""
             }
             
             # Try to parse structured response
-            lines = content.split('\n')
-            for line in lines:
-                if 'DIRECTION:' in line:
-                    direction = line.split(':')[1].strip()
-                    if direction in ['CALL', 'PUT']:
+            for line in content.splitlines():
+                # partition stops at the first colon without building a list
+                tag, sep, rest = line.partition(':')
+                if not sep:
+                    continue
+                tag = tag.rstrip()
+                if tag.endswith('DIRECTION'):
+                    direction = rest.strip()
+                    if direction in ('CALL', 'PUT'):
                         analysis['direction'] = direction
-                elif 'CONFIDENCE:' in line:
+                elif tag.endswith('CONFIDENCE'):
                     try:
-                        confidence = int(line.split(':')[1].strip().split()[0])
+                        confidence = int(rest.split(None, 1)[0])
                         if 1 <= confidence <= 10:
                             analysis['confidence'] = confidence
-                    except:
+                    except (IndexError, ValueError):
                         pass
-                elif 'REASONING:' in line:
-                    reasoning = line.split(':', 1)[1].strip()
-                    analysis['reasoning'] = reasoning
+                elif tag.endswith('REASONING'):
+                    analysis['reasoning'] = rest.strip()
             
             return analysis
             
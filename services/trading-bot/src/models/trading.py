@@ -1,8 +1,36 @@
-from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer, TypeAdapter, field_validator
+from typing import Annotated, Any, List, Literal, Optional, Union
+from datetime import datetime, timedelta
 from enum import Enum
 
+_EPOCH = datetime(1970, 1, 1)
+
+# time.time_ns() has passed 10**17 since 1973; smaller ints are epoch seconds or milliseconds
+MIN_TIMESTAMP_NS = 10**17
+_datetime_adapter = TypeAdapter(datetime)
+
+
+def _validate_timestamp(value: Any) -> Any:
+    """Keep time.time_ns() integers as they are and parse anything else the way a datetime field would."""
+    if type(value) is int and value >= MIN_TIMESTAMP_NS:
+        return value
+    return _datetime_adapter.validate_python(value)
+
+
+def _serialize_timestamp(value: Union[int, datetime]) -> datetime:
+    """Convert time.time_ns() integers to naive UTC datetimes when a model is dumped."""
+    if isinstance(value, int):
+        return _EPOCH + timedelta(microseconds=value // 1000)
+    return value
+
+
+# Hot paths store time.time_ns() integers; the datetime is only built at the API boundary
+Timestamp = Annotated[
+    Union[int, datetime],
+    BeforeValidator(_validate_timestamp),
+    PlainSerializer(_serialize_timestamp, return_type=datetime),
+]
+
 
 class AssetType(str, Enum):
     FOREX = "forex"
@@ -27,7 +55,7 @@ class TradeStatus(str, Enum):
 class MarketData(BaseModel):
     asset: str
     price: float
-    timestamp: datetime
+    timestamp: Timestamp
     volume: Optional[float] = None
     bid: Optional[float] = None
     ask: Optional[float] = None
@@ -42,6 +70,18 @@ class TradeRequest(BaseModel):
     risk_level: float = Field(ge=0.0, le=1.0, default=0.5)
 
 
+class TradeExecuteRequest(BaseModel):
+    asset: str
+    direction: TradeDirection
+    amount: float = Field(gt=0, le=10000)  # Safety limit
+    duration: Literal[60, 120, 300, 600, 900, 1800, 3600] = 60  # in seconds
+
+    @field_validator('direction', mode='before')
+    @classmethod
+    def normalize_direction(cls, v):
+        return v.lower() if isinstance(v, str) else v
+
+
 class TradeResponse(BaseModel):
     trade_id: str
     asset: str
@@ -51,8 +91,14 @@ class TradeResponse(BaseModel):
     exit_price: Optional[float] = None
     status: TradeStatus
     profit: Optional[float] = None
-    created_at: datetime
-    closed_at: Optional[datetime] = None
+    created_at: Timestamp
+    closed_at: Optional[Timestamp] = None
+
+
+class TradeHistoryResponse(BaseModel):
+    trades: List[TradeResponse]
+    count: int
+    timestamp: datetime
 
 
 class LLMResponse(BaseModel):
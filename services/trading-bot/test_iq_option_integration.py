@@ -103,7 +103,8 @@ async def test_real_api_with_credentials():
     
     # Check if credentials are available
     try:
-        from config.settings import settings
+        from config.settings import get_settings
+        settings = get_settings()
         
         if (not hasattr(settings, 'iq_option_email') or 
             not settings.iq_option_email or 
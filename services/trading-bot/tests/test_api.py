@@ -12,4 +12,11 @@ def test_health_check():
 def test_read_root():
     response = client.get("/")
     assert response.status_code == 200
-    assert "Welcome" in response.json()["message"]
\ No newline at end of file
+    assert "Welcome" in response.json()["message"]
+
+
+def test_clear_chart_cache():
+    response = client.post("/api/v1/chart/cache/clear")
+    assert response.status_code == 200
+    assert "cleared" in response.json()["message"]
+    assert response.json()["timestamp"]
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from src.core import manifests
+from src.core.manifests import (
+    BollingerBandsIndicator, EMAIndicator, MACDIndicator, RSIIndicator, SMAIndicator,
+)
+
+# 300-bar random walk shared by every test
+PRICES = (100 + np.cumsum(np.random.default_rng(42).normal(0, 1, 300))).tolist()
+
+
+def assert_close(actual, expected):
+    assert len(actual) == len(expected)
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+
+# Reference list implementations the vectorized indicators replaced
+
+def reference_ema(data, period):
+    if len(data) < period:
+        return []
+    multiplier = 2 / (period + 1)
+    ema_values = [sum(data[:period]) / period]
+    for i in range(period, len(data)):
+        ema_values.append((data[i] * multiplier) + (ema_values[-1] * (1 - multiplier)))
+    return ema_values
+
+
+def reference_sma(data, period):
+    return [sum(data[i-period+1:i+1]) / period for i in range(period - 1, len(data))]
+
+
+def reference_rsi(data, period):
+    deltas = [data[i] - data[i-1] for i in range(1, len(data))]
+    gains = [max(delta, 0) for delta in deltas]
+    losses = [abs(min(delta, 0)) for delta in deltas]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    rsi_values = []
+    for i in range(period, len(gains)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        rsi_values.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    return rsi_values
+
+
+def reference_bollinger(data, period, std_dev):
+    upper, middle, lower = [], [], []
+    for i in range(period - 1, len(data)):
+        window = data[i-period+1:i+1]
+        sma = sum(window) / period
+        std = (sum((x - sma) ** 2 for x in window) / period) ** 0.5
+        upper.append(sma + std_dev * std)
+        middle.append(sma)
+        lower.append(sma - std_dev * std)
+    return upper, middle, lower
+
+
+def reference_macd(data, fast_period, slow_period, signal_period):
+    """MACD with every series aligned to the last bar: fast and slow EMAs are paired on the same price."""
+    fast = reference_ema(data, fast_period)
+    slow = reference_ema(data, slow_period)
+    offset = slow_period - fast_period
+    macd = [fast[i + offset] - slow[i] for i in range(len(slow))]
+    signal = reference_ema(macd, signal_period)
+    histogram = [macd[i + signal_period - 1] - signal[i] for i in range(len(signal))]
+    return macd, signal, histogram
+
+
+@pytest.mark.parametrize("period", [5, 14, 20])
+def test_rsi_matches_reference(period):
+    result = RSIIndicator({"period": period}).calculate(PRICES)
+    assert_close(result["rsi"], reference_rsi(PRICES, period))
+
+
+def test_rsi_flat_prices():
+    assert RSIIndicator({"period": 14}).calculate([1.0] * 30)["rsi"] == [100.0] * 15
+
+
+@pytest.mark.parametrize("period", [5, 20, 50])
+def test_sma_matches_reference(period):
+    assert_close(SMAIndicator({"period": period}).calculate(PRICES)["sma"], reference_sma(PRICES, period))
+
+
+@pytest.mark.parametrize("period", [5, 20, 50])
+def test_ema_matches_reference(period):
+    assert_close(EMAIndicator({"period": period}).calculate(PRICES)["ema"], reference_ema(PRICES, period))
+
+
+@pytest.mark.parametrize("period,std_dev", [(5, 2), (20, 2), (50, 1.5)])
+def test_bollinger_matches_reference(period, std_dev):
+    result = BollingerBandsIndicator({"period": period, "std_dev": std_dev}).calculate(PRICES)
+    upper, middle, lower = reference_bollinger(PRICES, period, std_dev)
+    assert_close(result["upper"], upper)
+    assert_close(result["middle"], middle)
+    assert_close(result["lower"], lower)
+
+
+@pytest.mark.parametrize("use_kernel", [False, True])
+@pytest.mark.parametrize("count", [26, 30, 34, 300])
+def test_macd_matches_tail_aligned_reference(monkeypatch, use_kernel, count):
+    # Without numba installed the kernel still runs, as plain Python
+    monkeypatch.setattr(manifests, "HAS_NUMBA", use_kernel)
+    data = PRICES[:count]
+    result = MACDIndicator({}).calculate(data)
+    macd, signal, histogram = reference_macd(data, 12, 26, 9)
+    assert_close(result["macd"], macd)
+    assert_close(result["signal"], signal)
+    assert_close(result["histogram"], histogram)
+
+
+def test_macd_kernel_and_fallback_agree(monkeypatch):
+    params = {"fast_period": 5, "slow_period": 13, "signal_period": 4}
+    monkeypatch.setattr(manifests, "HAS_NUMBA", True)
+    kernel = MACDIndicator(params).calculate(PRICES)
+    monkeypatch.setattr(manifests, "HAS_NUMBA", False)
+    fallback = MACDIndicator(params).calculate(PRICES)
+    for key in ("macd", "signal", "histogram"):
+        assert_close(kernel[key], fallback[key])
+
+
+def test_macd_too_short():
+    assert MACDIndicator({}).calculate(PRICES[:25]) == {"macd": [], "signal": [], "histogram": []}
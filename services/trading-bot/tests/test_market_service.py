@@ -0,0 +1,23 @@
+import asyncio
+from datetime import datetime
+
+from src.core.market.service import MarketService
+from src.models.trading import MarketData
+
+
+def pushed_tick():
+    return MarketData(asset="EURUSD", price=2.0, timestamp=datetime(2024, 1, 1))
+
+
+def test_fresh_tick_is_served():
+    service = MarketService()
+    tick = pushed_tick()
+    service.publish_tick(tick)
+    assert asyncio.run(service.get_market_data("EURUSD")) is tick
+
+
+def test_stale_tick_falls_back(monkeypatch):
+    service = MarketService()
+    service.publish_tick(pushed_tick())
+    monkeypatch.setattr(MarketService, "MAX_TICK_AGE", -1.0)
+    assert asyncio.run(service.get_market_data("EURUSD")).price != 2.0
@@ -0,0 +1,42 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from src.models.trading import MarketData, TradeResponse
+
+
+def ns_and_datetime():
+    """The same instant as a time.time_ns() integer and as the naive UTC datetime utcnow() would give."""
+    ns = time.time_ns()
+    return ns, datetime(1970, 1, 1) + timedelta(microseconds=ns // 1000)
+
+
+def test_market_data_ns_timestamp_serializes_like_datetime():
+    ns, dt = ns_and_datetime()
+    from_ns = MarketData(asset="EURUSD", price=1.1, timestamp=ns)
+    from_dt = MarketData(asset="EURUSD", price=1.1, timestamp=dt)
+    assert from_ns.model_dump_json() == from_dt.model_dump_json()
+    assert jsonable_encoder(from_ns) == jsonable_encoder(from_dt)
+    assert jsonable_encoder(from_ns)["timestamp"] == dt.isoformat()
+
+
+def test_trade_response_ns_timestamp_serializes_like_datetime():
+    ns, dt = ns_and_datetime()
+    fields = dict(trade_id="1", asset="EURUSD", direction="call", amount=1.0, entry_price=1.1, status="executed")
+    from_ns = TradeResponse(created_at=ns, closed_at=ns, **fields)
+    from_dt = TradeResponse(created_at=dt, closed_at=dt, **fields)
+    assert from_ns.model_dump_json() == from_dt.model_dump_json()
+    assert TradeResponse.model_validate_json(from_ns.model_dump_json()).created_at == dt
+
+
+@pytest.mark.parametrize("value", [1700000000, 1700000000000, "1700000000"])
+def test_epoch_seconds_and_milliseconds_still_parse_as_datetimes(value):
+    market_data = MarketData(asset="EURUSD", price=1.1, timestamp=value)
+    assert market_data.timestamp == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+
+def test_invalid_timestamp_rejected():
+    with pytest.raises(ValidationError):
+        MarketData(asset="EURUSD", price=1.1, timestamp=True)
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.dependencies import get_llm_service, get_market_service, get_trading_service
+from src.api.main import app
+from src.models.trading import LLMResponse, MarketData, TradeResponse, TradeStatus
+
+TRADE = {"asset": "EURUSD", "direction": "call", "amount": 100.0, "duration": 60}
+
+
+class StubIQService:
+    def __init__(self, connected=True, market_open=True, balance=1000.0):
+        self.connected = connected
+        self.market_open = market_open
+        self.balance = balance
+
+    async def is_market_open(self, asset):
+        return self.market_open
+
+    async def get_balance(self):
+        return self.balance
+
+
+class StubMarketService:
+    async def get_market_data(self, asset):
+        return MarketData(asset=asset, price=1.1, timestamp=time.time_ns())
+
+
+class StubLLMService:
+    async def get_trading_decision(self, asset, market_data, risk_level=0.5):
+        return LLMResponse(decision="call", confidence=0.8, reasoning="test",
+                           entry_price=market_data.price, time_frame="1m")
+
+
+class StubTradingService:
+    def __init__(self, iq_service):
+        self.iq_option_service = iq_service
+
+    async def execute_trade(self, trade_request, llm_decision):
+        return TradeResponse(trade_id="1", asset=trade_request.asset, direction=trade_request.direction,
+                             amount=trade_request.amount, entry_price=llm_decision.entry_price,
+                             status=TradeStatus.EXECUTED, created_at=time.time_ns())
+
+
+@pytest.fixture
+def trade_client():
+    def make(**iq_state):
+        trading_service = StubTradingService(StubIQService(**iq_state))
+        app.dependency_overrides[get_market_service] = StubMarketService
+        app.dependency_overrides[get_llm_service] = StubLLMService
+        app.dependency_overrides[get_trading_service] = lambda: trading_service
+        return TestClient(app)
+    yield make
+    app.dependency_overrides.clear()
+
+
+def test_trade_executes(trade_client):
+    response = trade_client().post("/api/v1/trade", json=TRADE)
+    assert response.status_code == 200
+    assert response.json()["status"] == "executed"
+
+
+def test_trade_rejected_when_market_closed(trade_client):
+    response = trade_client(market_open=False).post("/api/v1/trade", json=TRADE)
+    assert response.status_code == 400
+    assert "Market is closed" in response.json()["detail"]
+
+
+def test_trade_rejected_on_insufficient_balance(trade_client):
+    response = trade_client(balance=50.0).post("/api/v1/trade", json=TRADE)
+    assert response.status_code == 400
+    assert "Insufficient balance" in response.json()["detail"]
+
+
+def test_trade_unavailable_when_broker_disconnected(trade_client):
+    response = trade_client(connected=False, market_open=False, balance=0.0).post("/api/v1/trade", json=TRADE)
+    assert response.status_code == 503
+    assert "not connected" in response.json()["detail"]